@@ -1,16 +1,30 @@
 import math
+import numpy as np
 import networkx as nx
+from functools import partial
 
 from data_preparation import generate_data, generate_with_antichain , create_graph
+from decomposition import decompose
+from relations import ReachabilityIndex, Poset, transitive_reduction, get_bitmasks, get_bit_indices, get_cover_bitmasks
+from parallel import parallel_count
+from cache import CountCache, cached
+from instrumentation import Instrumentation, phase, run_counter
+from vectorized import vectorized_count
 
 
-def divide_and_conquer(partial_order, memo=None):
+def divide_and_conquer(partial_order, memo=None, processes=None, stats=None):
     """
     Osnovni deli in vladaj algoritem, ki deluje v casu O(n*2^n)
-    :param partial_order: networkx.DiGraph - vozlisca so mnozice tock, povezava u -> v pomeni, da je u < v
-    :param memo: dictionary - memoizacija, kljuci so urejene terke, ki predstavljajo mnozico vozlisc, ki je v grafu, vrednosti so stevila linearnih razsiritev
+    :param partial_order: networkx.DiGraph ali relations.Poset - vozlisca so mnozice tock, povezava u -> v pomeni, da
+                          je u < v; graf se med izvajanjem spreminja (in na koncu obnovi), Poset pa le zozuje
+    :param memo: dictionary ali memo.MemoStore - memoizacija, kljuci so urejene terke, ki predstavljajo mnozico vozlisc, ki je v grafu (pri Poset bitne maske vozlisc), vrednosti so stevila linearnih razsiritev
+    :param processes: int - ce je podano, mrezo idealov vzporedno obdela toliko procesov (parallel.parallel_count)
+    :param stats: dictionary - stevci instrumentacije (Instrumentation.counters), None pomeni brez stetja
     :return: Stevilo linearnih razsiritev
     """
+    if processes is not None:
+        return parallel_count(partial_order, processes)
+
     if memo is None:
         memo = {}
 
@@ -18,33 +32,181 @@ def divide_and_conquer(partial_order, memo=None):
     if partial_order.order() == 1:
         return 1
 
-    # Urejena terka za memoizacijo
-    nodes = tuple(sorted(partial_order.nodes()))
+    # Urejena terka za memoizacijo, pri Poset kar bitna maska preostalih vozlisc
+    nodes = partial_order.mask if isinstance(partial_order, Poset) else tuple(sorted(partial_order.nodes()))
     # Preverimo, ce imamo stevilo ze naracunano
     linear_extensions = memo.get(nodes, None)
     if linear_extensions is not None:
+        if stats is not None:
+            stats["memo_hits"] += 1
         return linear_extensions
 
     # Gremo rekurzivno po maksimalnih elementih (tistih brez izhodnih povezav)
     linear_extensions = 0
-    out_degrees = list(partial_order.out_degree())
-    for node, degree in out_degrees:
-        if degree == 0:
-            # Seznam povezav, ki jih odstranimo
-            removed = [(pred, node) for pred in partial_order.predecessors(node)]
-            partial_order.remove_node(node)
-            # Rekurziven klic
-            linear_extensions += divide_and_conquer(partial_order, memo)
-            # Vrnemo odstranjeno vozlisce in povezave
-            partial_order.add_node(node)
-            for u, v in removed:
-                partial_order.add_edge(u, v)
+    branches = 0
+    if isinstance(partial_order, Poset):
+        # Zozitev ne kopira tabel, zato delne urejenosti ni treba spreminjati in obnavljati
+        mask = partial_order.mask
+        for i in get_bit_indices(mask):
+            if partial_order.up[i] & mask == 0:
+                linear_extensions += divide_and_conquer(partial_order.restrict(mask ^ (1 << i)), memo, stats=stats)
+                branches += 1
+    else:
+        for node, degree in list(partial_order.out_degree()):
+            if degree == 0:
+                # Seznam povezav, ki jih odstranimo
+                removed = [(pred, node) for pred in partial_order.predecessors(node)]
+                partial_order.remove_node(node)
+                # Rekurziven klic
+                linear_extensions += divide_and_conquer(partial_order, memo, stats=stats)
+                # Vrnemo odstranjeno vozlisce in povezave
+                partial_order.add_node(node)
+                for u, v in removed:
+                    partial_order.add_edge(u, v)
+                branches += 1
 
     # Shranimo v memoizacijo
     memo[nodes] = linear_extensions
+    if stats is not None:
+        stats["memo_misses"] += 1
+        stats["states"] += 1
+        stats["branches"] += branches
+        stats["max_branches"] = max(stats["max_branches"], branches)
+        stats["peak_memo"] = max(stats["peak_memo"], len(memo))
     return linear_extensions
 
 
+def bitmask_divide_and_conquer(partial_order, memo=None, stats=None):
+    """
+    Deli in vladaj algoritem brez rekurzije in brez spreminjanja grafa. Vsak ideal (navzdol zaprta podmnozica) je
+    predstavljen z enim celim stevilom, mreza idealov pa se pregleda nivo po nivoju od praznega ideala navzgor.
+    Ideal I | {x} dobi vse linearne razsiritve ideala I, ce je x minimalen element komplementa I.
+    :param partial_order: networkx.DiGraph - vozlisca so mnozice tock, povezava u -> v pomeni, da je u < v
+    :param memo: dictionary - ce je podan, vanj zapisemo stevila linearnih razsiritev vseh idealov (kljuci so bitne
+                 maske); sicer hranimo le trenutni in naslednji nivo
+    :return: Stevilo linearnih razsiritev
+    """
+    n = partial_order.order()
+    if n <= 1:
+        return 1
+
+    _, predecessors, _ = get_bitmasks(partial_order)
+    full = (1 << n) - 1
+
+    if memo is not None:
+        memo[0] = 1
+    level = {0: 1}
+    # Vsak nivo vsebuje ideale z enim elementom vec kot prejsnji
+    for _ in range(n):
+        next_level = {}
+        for ideal, count in level.items():
+            # Kandidati so elementi izven ideala, ki imajo vse predhodnike ze v idealu
+            free = full & ~ideal
+            while free:
+                bit = free & -free
+                free ^= bit
+                if predecessors[bit.bit_length() - 1] & ~ideal == 0:
+                    extended = ideal | bit
+                    next_level[extended] = next_level.get(extended, 0) + count
+        if memo is not None:
+            memo.update(next_level)
+        if stats is not None:
+            memo_size = len(memo) if memo is not None else len(level) + len(next_level)
+            _update_level_stats(stats, predecessors, full, level, next_level, memo_size)
+        level = next_level
+
+    return level[full]
+
+
+def _update_level_stats(stats, predecessors, full, level, next_level, memo_size):
+    """
+    Funkcija, ki po obdelanem nivoju posodobi stevce instrumentacije bitnega deli in vladaj algoritma
+    """
+    contributions = 0
+    for ideal in level:
+        branches = sum(1 for i in get_bit_indices(full & ~ideal) if predecessors[i] & ~ideal == 0)
+        contributions += branches
+        stats["max_branches"] = max(stats["max_branches"], branches)
+    stats["states"] += len(level)
+    stats["branches"] += contributions
+    stats["memo_misses"] += len(next_level)
+    stats["memo_hits"] += contributions - len(next_level)
+    stats["peak_memo"] = max(stats["peak_memo"], memo_size)
+
+
+def _count_levels(required, full, steps, stats=None):
+    """
+    Funkcija, ki od prazne mnozice navzgor pregleda steps nivojev mreze mnozic, v katere element x lahko dodamo, ko
+    mnozica vsebuje required[x]. Hrani le trenutni in naslednji nivo.
+    :param required: int list - maske elementov, ki morajo biti v mnozici pred x (predhodniki ali nasledniki)
+    :param full: int - maska vseh elementov
+    :param steps: int - stevilo nivojev
+    :param stats: dictionary - stevci instrumentacije, None pomeni brez stetja
+    :return: dictionary - mnozice zadnjega nivoja (bitne maske) in stevila poti do njih
+    """
+    level = {0: 1}
+    for _ in range(steps):
+        next_level = {}
+        for ideal, count in level.items():
+            free = full & ~ideal
+            while free:
+                bit = free & -free
+                free ^= bit
+                if required[bit.bit_length() - 1] & ~ideal == 0:
+                    extended = ideal | bit
+                    next_level[extended] = next_level.get(extended, 0) + count
+        if stats is not None:
+            _update_level_stats(stats, required, full, level, next_level, len(level) + len(next_level))
+        level = next_level
+    return level
+
+
+def meet_in_the_middle(partial_order, stats=None):
+    """
+    Stetje linearnih razsiritev s srecanjem na sredini mreze idealov. Vsaka linearna razsiritev gre skozi natanko en
+    ideal I velikosti floor(n/2), zato je e(P) vsota e(I) * e(P - I) po idealih srednjega nivoja. Stevila e(I) dobimo
+    z nivoji od praznega ideala navzgor, stevila e(P - I) pa z nivoji od celotne mnozice navzdol (dodajamo elemente,
+    katerih nasledniki so ze v mnozici). V pomnilniku sta hkrati le dva sosednja nivoja in srednji nivo, ne cela
+    mreza idealov kot pri divide_and_conquer.
+    :param partial_order: networkx.DiGraph - vozlisca so mnozice tock, povezava u -> v pomeni, da je u < v
+    :param stats: dictionary - stevci instrumentacije (Instrumentation.counters), None pomeni brez stetja
+    :return: Stevilo linearnih razsiritev
+    """
+    n = partial_order.order()
+    if n <= 1:
+        return 1
+
+    _, predecessors, successors = get_bitmasks(partial_order)
+    full = (1 << n) - 1
+    middle = n // 2
+
+    lower = _count_levels(predecessors, full, middle, stats)
+    upper = _count_levels(successors, full, n - middle, stats)
+    if stats is not None:
+        stats["peak_memo"] = max(stats["peak_memo"], len(lower) + len(upper))
+    # Komplement ideala srednjega nivoja je zgornja mnozica, ki jo doseze pregled od zgoraj
+    return sum(count * upper[full ^ ideal] for ideal, count in lower.items())
+
+def get_maximal_matching(all_edges):
+    """
+    Funkcija, ki pozresno poisce maksimalno ujemanje v grafu primerljivosti. Vozlisca obdela v vrstnem redu grafa in
+    vsakega poveze z najmanjsim se prostim vecjim elementom, kar ustreza nx.maximal_matching na tranzitivni ovojnici.
+    :param all_edges: ReachabilityIndex - indeks primerljivosti
+    :return: set - maksimalno ujemanje, povezave (u, v), kjer je u < v
+    """
+    M = set()
+    free = (1 << len(all_edges.labels)) - 1
+    for i, mask in enumerate(all_edges.up):
+        if not (free >> i) & 1:
+            continue
+        candidates = mask & free
+        if candidates:
+            bit = candidates & -candidates
+            free &= ~(bit | (1 << i))
+            M.add((all_edges.labels[i], all_edges.labels[bit.bit_length() - 1]))
+    return M
+
+
 def get_matching_nodes(M):
     """
     Funkcija, ki vrne vozlišča maksimalne ujemanosti
@@ -63,7 +225,7 @@ def get_separated(edge, A, all_edges):
     Funkcija, ki preveri če je povezava razdvojena in poišče element antivirige, ki povzroči razdvojenost povezave
     :param edge: edge - povezava
     :param A: set - antiveriga
-    :param all_edges: set povezav - povezava u -> v pomeni, da je u < v
+    :param all_edges: ReachabilityIndex ali set povezav - (u, v) in all_edges pomeni, da je u < v
     :return: bool - ali je povezava razdvojena; int - vozlišče antiverige
     """
     for a in A:
@@ -74,126 +236,245 @@ def get_separated(edge, A, all_edges):
 
 def get_canonical_matching(M, A, all_edges):
     """
-    Funkcija, ki vrne kanonično maksimalno ujemanje
+    Funkcija, ki vrne kanonično maksimalno ujemanje. Za vsak element antiverige hranimo povezave, ki jih razdvaja, in
+    za vsako povezavo elemente, ki jo razdvajajo, zato po zamenjavi povezave (u, v) z (a, v) popravimo le vnose za
+    povezavi in za elementa a ter u.
     :param M: set - maksimalno ujemanje
     :param A: set - antiveriga
-    :param all_edges: set povezav - povezava u -> v pomeni, da je u < v
+    :param all_edges: ReachabilityIndex ali set povezav - (u, v) in all_edges pomeni, da je u < v
     :return: set - kanonično maksimalno ujemanje
     """
-    for edge in M:
-        is_separated, replacement = get_separated(edge, A, all_edges)
-        if is_separated:
-            M.remove(edge)
-            M.add((replacement, edge[1]))
-            A.remove(replacement)
-            A.add(edge[0])
-            get_canonical_matching(M, A, all_edges)
-            break
+    def separated(a):
+        return {edge for edge in M if (edge[0], a) in all_edges and (a, edge[1]) in all_edges}
+
+    # separates[a] so povezave, ki jih razdvaja a, separated_by[edge] pa elementi, ki razdvajajo povezavo
+    separates = {a: separated(a) for a in A}
+    separated_by = {edge: set() for edge in M}
+    for a, edges in separates.items():
+        for edge in edges:
+            separated_by[edge].add(a)
+
+    pending = [a for a in A if separates[a]]
+    while pending:
+        a = pending[-1]
+        if not separates.get(a):
+            pending.pop()
+            continue
+
+        # Povezavo (u, v) zamenjamo z (a, v), a odstranimo iz antiverige in dodamo u
+        edge = next(iter(separates[a]))
+        u, v = edge
+        for b in separated_by.pop(edge):
+            separates[b].discard(edge)
+        for other in separates.pop(a):
+            separated_by[other].discard(a)
+        M.remove(edge)
+        A.remove(a)
+        A.add(u)
+
+        separates[u] = separated(u)
+        for other in separates[u]:
+            separated_by[other].add(u)
+        if separates[u]:
+            pending.append(u)
+
+        new_edge = (a, v)
+        M.add(new_edge)
+        separated_by[new_edge] = {b for b in A if (a, b) in all_edges and (b, v) in all_edges}
+        for b in separated_by[new_edge]:
+            separates[b].add(new_edge)
+            pending.append(b)
     return M
 
 
 def make_bipartite_triplets(M, A, all_edges):
     """
-    Funkcija, ki vrne bipartitni graf za trojčke, kot je opisano v članku
+    Funkcija, ki vrne bipartitni graf za trojčke, kot je opisano v članku. Element a je sosed povezave m, če je
+    primerljiv s katerim od njenih krajišč, kar izračunamo hkrati za vse pare iz matrike primerljivosti.
     :param M: set - kanonično maskimalno ujemanje
     :param A: set - antiveriga
-    :param all_edges: set povezav - povezava u -> v pomeni, da je u < v
-    :return: nx.Graph() - bipartitni graf za trojčke
+    :param all_edges: ReachabilityIndex - indeks primerljivosti
+    :return: (list, list, 2D numpy array) - elementi A, povezave M in matrika sosednosti bipartitnega grafa
     """
-    B = nx.Graph()
-    B.add_nodes_from(A, bipartite=0)
-    B.add_nodes_from(M, bipartite=1)
-    for a in A:
-        for m in M:
-            if (a, m[0]) in all_edges or (m[0], a) in all_edges or (a, m[1]) in all_edges or (m[1], a) in all_edges:
-                B.add_edge(a, m)
-    return B
+    A = list(A)
+    M = list(M)
+    C = all_edges.comparability_matrix()[all_edges.positions(A)]
+    adjacency = C[:, all_edges.positions(m[0] for m in M)] | C[:, all_edges.positions(m[1] for m in M)]
+    return A, M, adjacency
 
 
 def get_bipartite_quartets(T, A, all_edges):
     """
-    Funkcija, ki vrne bipartitni graf za četvorčke opisan v članku
+    Funkcija, ki vrne bipartitni graf za četvorčke opisan v članku. Element a je sosed trojčka t, če je primerljiv s
+    katerim od njegovih treh elementov.
     :param T: set - trojčki
     :param A: set - antiveriga
-    :param all_edges: set povezav, povezava u -> v pomeni, da je u < v
-    :return: nx.Graph() - bipartitni graf za četvorčke
+    :param all_edges: ReachabilityIndex - indeks primerljivosti
+    :return: (list, list, 2D numpy array) - elementi A, trojčki T in matrika sosednosti bipartitnega grafa
     """
-
-    B = nx.Graph()
-    B.add_nodes_from(A, bipartite=0)
-    B.add_nodes_from(T, bipartite=1)
-    for a in A:
-        for t in T:
-            if (a, t[0]) in all_edges or (t[0], a) in all_edges:
-                B.add_edge(a, t)
-            else:
-                if (a, t[1][0]) in all_edges or (t[1][0], a) in all_edges or (a, t[1][1]) in all_edges or (t[1][1], a) in all_edges:
-                    B.add_edge(a, t)
-    return B
+    A = list(A)
+    T = list(T)
+    C = all_edges.comparability_matrix()[all_edges.positions(A)]
+    adjacency = (C[:, all_edges.positions(t[0] for t in T)] | C[:, all_edges.positions(t[1][0] for t in T)] |
+                 C[:, all_edges.positions(t[1][1] for t in T)])
+    return A, T, adjacency
 
 
-def paper_algorithm(partial_order, triplets=True):
+def get_bipartite_matching(left, right, adjacency):
+    """
+    Funkcija, ki vrne požrešno maksimalno ujemanje bipartitnega grafa. Vsakemu elementu leve strani po vrsti dodeli
+    prvega prostega soseda, kar je enako ujemanju, ki ga nx.maximal_matching vrne za graf z enakim vrstnim redom vozlišč.
+    :param left: list - vozlišča leve strani
+    :param right: list - vozlišča desne strani
+    :param adjacency: 2D numpy array tipa bool - matrika sosednosti
+    :return: set - pari (levo vozlišče, desno vozlišče)
+    """
+    matching = set()
+    if not right:
+        return matching
+
+    free = np.ones(len(right), dtype=bool)
+    for i, node in enumerate(left):
+        candidates = adjacency[i] & free
+        j = candidates.argmax()
+        if candidates[j]:
+            free[j] = False
+            matching.add((node, right[j]))
+    return matching
+
+
+def paper_algorithm(partial_order, triplets=True, counter=divide_and_conquer, decomposition=False, processes=None,
+                    instrumentation=None):
     """
     Algoritem z boljso casovno zahtevnostjo, predstavljen v clanku
-    :param partial_order: networkx.DiGraph - vozlisca so mnozice tock, povezava u -> v pomeni, da je u < v
+    :param partial_order: networkx.DiGraph ali relations.Poset - vozlisca so mnozice tock, povezava u -> v pomeni, da
+                          je u < v
     :param triplets: boolean - ali algoritem ujemanje se dodatno deli na trojcke in cetvorcke
-    :return: (linear_extensions, large_case, A_size) - Stevilo linearnih razsiritev, indikator, ki pove ali je alfa vecja od 1/3 (uporabimo osnovni algoritem) ter velikost mnozice A
+    :param counter: function - algoritem za koncno stetje linearnih razsiritev (divide_and_conquer,
+                    bitmask_divide_and_conquer, meet_in_the_middle, vectorized.vectorized_count ali
+                    chains.chain_count)
+    :param decomposition: boolean - ali delno urejenost najprej razbijemo na nerazcepne kose (decomposition.decompose)
+                          in algoritem izvedemo na vsakem kosu posebej
+    :param processes: int - ce je podano, koncno stetje namesto counter izvede parallel.parallel_count s toliko procesi
+    :param instrumentation: instrumentation.Instrumentation ali True - ce je podana, vanjo zapisemo case faz in stevce
+                            stetja (True pomeni novo instrumentacijo) in jih vrnemo skupaj z rezultatom
+    :return: (linear_extensions, large_case, A_size) - Stevilo linearnih razsiritev, indikator, ki pove ali je alfa vecja od 1/3 (uporabimo osnovni algoritem) ter velikost mnozice A;
+             z instrumentacijo (linear_extensions, large_case, A_size, report), kjer je report Instrumentation.report()
     """
+    if instrumentation is True:
+        instrumentation = Instrumentation()
+    result = _paper_algorithm(partial_order, triplets, counter, decomposition, processes, instrumentation)
+    if instrumentation is None:
+        return result
+    return result + (instrumentation.report(),)
 
-    # Shranimo kopija grafa, da se ta zunaj funkcije ne spremeni
-    partial_order = partial_order.copy()
+
+def _paper_algorithm(partial_order, triplets, counter, decomposition, processes, instrumentation):
+    """
+    Funkcija, ki izvede algoritem iz clanka (glej paper_algorithm) in vrne le (linear_extensions, large_case, A_size)
+    """
+    if decomposition:
+        # Pri razbitju je large_case prisoten, ce ga ima vsaj en kos, velikosti A pa sestejemo
+        with phase(instrumentation, "decomposition"):
+            linear_extensions, pieces = decompose(partial_order)
+        large_case = False
+        A_size = 0
+        for piece in pieces:
+            count, piece_large_case, piece_A_size = _paper_algorithm(piece, triplets, counter, False, processes,
+                                                                     instrumentation)
+            linear_extensions *= count
+            large_case = large_case or piece_large_case
+            A_size += piece_A_size
+        return linear_extensions, large_case, A_size
+
+    if processes is not None:
+        counter = partial(parallel_count, processes=processes)
+
+    reduced, linear_extensions, large_case, A_size = paper_reduction(partial_order, triplets, instrumentation)
+    with phase(instrumentation, "counting"):
+        linear_extensions *= run_counter(counter, reduced, instrumentation)
+    return linear_extensions, large_case, A_size
+
+
+def paper_reduction(partial_order, triplets=True, instrumentation=None):
+    """
+    Funkcija, ki izvede korake algoritma iz clanka pred koncnim stetjem: poisce ujemanje in, ce ni large matching
+    case, elemente vsakega razreda mnozice A poveze v verigo
+    :param partial_order: networkx.DiGraph ali relations.Poset - vozlisca so mnozice tock, povezava u -> v pomeni, da
+                          je u < v
+    :param triplets: boolean - ali algoritem ujemanje se dodatno deli na trojcke in cetvorcke
+    :param instrumentation: instrumentation.Instrumentation - ce je podana, vanjo zapisemo case faz
+    :return: (reduced, factor, large_case, A_size) - delna urejenost, na kateri opravimo koncno stetje (graf pokritij
+             oziroma Poset, ce je bil vhod Poset), produkt |Ai|!, indikator large matching case ter velikost mnozice
+             A; e(P) = factor * e(reduced)
+    """
+    poset = isinstance(partial_order, Poset)
+    with phase(instrumentation, "reduction"):
+        # Indeks primerljivosti nadomesti mnozico vseh povezav, zato vhodni graf lahko vsebuje le pokritja
+        all_edges = ReachabilityIndex(partial_order)
+        if poset:
+            # Poset ostane nespremenjen, pokritja pa potrebujemo le za sosescine elementov A
+            covers = [up | down for up, down in zip(get_cover_bitmasks(all_edges.up),
+                                                    get_cover_bitmasks(all_edges.down))]
+        else:
+            # Algoritem nadaljuje na novem grafu pokritij, zato se vhodni graf zunaj funkcije ne spremeni
+            partial_order = transitive_reduction(partial_order, all_edges)
 
     linear_extensions = 1
-    all_edges = set(partial_order.edges())
     n = partial_order.number_of_nodes()
 
-    M = nx.maximal_matching(partial_order)
+    with phase(instrumentation, "matching"):
+        M = get_maximal_matching(all_edges)
     # large matching ali small matching
-    if triplets:
-        if len(M)/n >= 1/3:
-            return divide_and_conquer(partial_order), True, 0
-    else:
-        if len(M)/n > 1/6:
-            return divide_and_conquer(partial_order), True, 0
+    if (triplets and len(M)/n >= 1/3) or (not triplets and len(M)/n > 1/6):
+        return partial_order, 1, True, 0
 
     W = get_matching_nodes(M)
     A = set(partial_order.nodes()) - W
 
     if triplets:
         # maksimalno kanonično ujemanje
-        canonical_maximum_matching = get_canonical_matching(M, A, all_edges)
-        W = get_matching_nodes(canonical_maximum_matching)
-        A = set(partial_order.nodes()) - W
+        with phase(instrumentation, "canonical_matching"):
+            canonical_maximum_matching = get_canonical_matching(M, A, all_edges)
+            W = get_matching_nodes(canonical_maximum_matching)
+            A = set(partial_order.nodes()) - W
 
         # trojčki
-        triplets_bipartite = make_bipartite_triplets(canonical_maximum_matching, A, all_edges)
-        M_triplets = nx.maximal_matching(triplets_bipartite)
-        for edge in M_triplets:
-            A.remove(edge[0])
+        with phase(instrumentation, "triplets"):
+            M_triplets = get_bipartite_matching(*make_bipartite_triplets(canonical_maximum_matching, A, all_edges))
+            for edge in M_triplets:
+                A.remove(edge[0])
 
         # četvorčki
-        quartets_bipartite = get_bipartite_quartets(M_triplets, A, all_edges)
-        M_quartets = nx.maximal_matching(quartets_bipartite)
-        for edge in M_quartets:
-            A.remove(edge[0])
+        with phase(instrumentation, "quartets"):
+            M_quartets = get_bipartite_matching(*get_bipartite_quartets(M_triplets, A, all_edges))
+            for edge in M_quartets:
+                A.remove(edge[0])
 
     # particija A v razrede glede na sosede
-    A_line = dict()
-    for node in A:
-        neighborhood = tuple(sorted(list(partial_order.predecessors(node)) + list(partial_order.successors(node))))
-        if neighborhood in A_line:
-            A_line[neighborhood].append(node)
-        else:
-            A_line[neighborhood] = [node]
+    with phase(instrumentation, "A_line"):
+        A_line = dict()
+        for node in A:
+            if poset:
+                neighbors = get_bit_indices(covers[all_edges.index[node]])
+                neighborhood = tuple(sorted(all_edges.labels[j] for j in neighbors))
+            else:
+                neighborhood = tuple(sorted(list(partial_order.predecessors(node)) + list(partial_order.successors(node))))
+            if neighborhood in A_line:
+                A_line[neighborhood].append(node)
+            else:
+                A_line[neighborhood] = [node]
 
     # konstrukcija nove delne urejenosti in kalkulacija produkta |Ai|!
-    for a in A_line.values():
-        nx.add_path(partial_order, a)
-        linear_extensions *= math.factorial(len(a))
-
-    linear_extensions *= divide_and_conquer(partial_order)
+    with phase(instrumentation, "paths"):
+        if poset:
+            partial_order = partial_order.add_chains(A_line.values())
+        for a in A_line.values():
+            if not poset:
+                nx.add_path(partial_order, a)
+            linear_extensions *= math.factorial(len(a))
 
-    return linear_extensions, False, len(A)
+    return partial_order, linear_extensions, False, len(A)
 
 
 if __name__ == "__main__":
@@ -205,6 +486,8 @@ if __name__ == "__main__":
     st_antiverig = 10
     generate_with_antichain(velikosti[:2], st_antiverig, velikosti_antiverig, seed=2)
 
+    # Referencne rezultate deli in vladaj algoritma hranimo v predpomnilniku, da ponovni preizkusi niso pocasni
+    reference = cached(divide_and_conquer, CountCache('../results/counts.sqlite'))
 
     # Preizkus pravilnosti algoritmov
     for n in velikosti:
@@ -215,11 +498,17 @@ if __name__ == "__main__":
             g = create_graph(path)
 
             # Izvedemo oba algoritma, razsirimo rezultate
-            l1 = divide_and_conquer(g)
+            l1 = reference(g)
             l2, _, _ = paper_algorithm(g)
+            l3 = bitmask_divide_and_conquer(g)
+            l4, _, _ = paper_algorithm(g, counter=vectorized_count)
+            l5 = meet_in_the_middle(g)
             print(f"Rezultat deli in vladaj algoritma na vhodu {path}:", l1)
             print(f"Rezultat algoritma iz clanka na vhodu {path}:", l2)
-            assert (l1 == l2)
+            print(f"Rezultat deli in vladaj algoritma z bitnimi maskami na vhodu {path}:", l3)
+            print(f"Rezultat algoritma iz clanka z vektorskim stetjem na vhodu {path}:", l4)
+            print(f"Rezultat stetja s srecanjem na sredini na vhodu {path}:", l5)
+            assert (l1 == l2 == l3 == l4 == l5)
 
     for n in velikosti[:2]:
         for k in range(st_antiverig):
@@ -229,8 +518,14 @@ if __name__ == "__main__":
             g = create_graph(path)
 
             # Izvedemo oba algoritma, razsirimo rezultate
-            l1 = divide_and_conquer(g)
+            l1 = reference(g)
             l2, _, _ = paper_algorithm(g)
+            l3 = bitmask_divide_and_conquer(g)
+            l4, _, _ = paper_algorithm(g, counter=vectorized_count)
+            l5 = meet_in_the_middle(g)
             print(f"Rezultat deli in vladaj algoritma na vhodu {path}:", l1)
             print(f"Rezultat algoritma iz clanka na vhodu {path}:", l2)
-            assert (l1 == l2)
\ No newline at end of file
+            print(f"Rezultat deli in vladaj algoritma z bitnimi maskami na vhodu {path}:", l3)
+            print(f"Rezultat algoritma iz clanka z vektorskim stetjem na vhodu {path}:", l4)
+            print(f"Rezultat stetja s srecanjem na sredini na vhodu {path}:", l5)
+            assert (l1 == l2 == l3 == l4 == l5)
\ No newline at end of file
@@ -0,0 +1,218 @@
+import os
+import sys
+import math
+import numpy as np
+import multiprocessing as mp
+from statistics import NormalDist
+
+from relations import get_less_matrix
+
+
+def _mix(L, less, steps, rng):
+    """
+    Funkcija, ki na vseh sprehajalcih hkrati izvede steps korakov verige sosednjih transpozicij (Bubley-Dyer). V enem
+    koraku poskusimo hkrati na vseh disjunktnih parih sosednjih mest (i, i + 1) s sodim oziroma lihim i: elementa
+    zamenjamo z verjetnostjo 1/2, ce sta neprimerljiva. Zamenjave na disjunktnih parih so neodvisne, zato je prehodna
+    matrika koraka simetricna in enakomerna porazdelitev ostane stacionarna.
+    :param L: 2D numpy array oblike (W, n) - linearne razsiritve sprehajalcev (spremeni se na mestu)
+    :param less: 2D numpy array tipa bool - less[a, b] pove, ali je a < b
+    :param steps: int - stevilo korakov
+    :param rng: numpy.random.Generator - generator nakljucnih stevil
+    """
+    n = L.shape[1]
+    flat = less.ravel()
+    for step in range(steps):
+        start = step % 2
+        a = L[:, start:n - 1:2]
+        b = L[:, start + 1:n:2]
+        # a je pred b, zato zamenjavo prepreci le a < b
+        swap = rng.random(a.shape, dtype=np.float32) < 0.5
+        swap &= ~flat[a.astype(np.intp) * n + b]
+        a, b = np.where(swap, b, a), np.where(swap, a, b)
+        L[:, start:n - 1:2] = a
+        L[:, start + 1:n:2] = b
+
+
+def _comparisons(order, seed=0):
+    """
+    Funkcija, ki doloci fiksno zaporedje primerjav, s katerimi delno urejenost dopolnimo do verige order. Elemente v
+    nakljucnem (a fiksnem) vrstnem redu uredimo z urejanjem z zlivanjem glede na polozaj v order in zabelezimo vse
+    primerjave. Urejanje z zlivanjem naredi najvec n log n primerjav, ki skupaj dolocajo celotno ureditev, delezi
+    linearnih razsiritev, ki posamezni primerjavi ustrezajo, pa so zaradi nakljucnega zacetnega vrstnega reda
+    navadno blizu 1/2.
+    :param order: 1D numpy array - linearna razsiritev, v katero dopolnjujemo
+    :param seed: int - seme zacetnega vrstnega reda
+    :return: list of tuples - pari (x, y), kjer je x pred y v order
+    """
+    position = np.empty(len(order), dtype=int)
+    position[order] = np.arange(len(order))
+    comparisons = []
+
+    def merge_sort(items):
+        if len(items) <= 1:
+            return items
+        left = merge_sort(items[:len(items) // 2])
+        right = merge_sort(items[len(items) // 2:])
+        merged = []
+        i = j = 0
+        while i < len(left) and j < len(right):
+            x, y = left[i], right[j]
+            if position[x] < position[y]:
+                comparisons.append((x, y))
+                merged.append(x)
+                i += 1
+            else:
+                comparisons.append((y, x))
+                merged.append(y)
+                j += 1
+        return merged + left[i:] + right[j:]
+
+    merge_sort(list(np.random.default_rng(seed).permutation(order)))
+    return comparisons
+
+
+def _estimate(less, walkers, mixing, burn_in, seed):
+    """
+    Funkcija, ki z eno populacijo sprehajalcev (zaporedno Monte Carlo metodo) oceni logaritem obratne vrednosti
+    stevila linearnih razsiritev s teleskopskim produktom. Delni urejenosti po vrsti dodajamo primerjave iz fiksnega
+    zaporedja (_comparisons), dokler ne postane veriga. Za vsako dodano primerjavo x < y je e(P + (x < y)) / e(P)
+    delez linearnih razsiritev P, v katerih je x pred y, ki ga ocenimo iz sprehajalcev. Nato sprehajalce, ki
+    primerjavi ne ustrezajo, nadomestimo s kopijami ustreznih in jih premesamo z verigo nove delne urejenosti.
+    Produkt ocenjenih delezev je nepristranska ocena 1 / e(P), ce so sprehajalci na zacetku enakomerno porazdeljeni,
+    zato jih pred prvo primerjavo dovolj dolgo mesamo.
+    :param less: 2D numpy array tipa bool - less[a, b] pove, ali je a < b (tranzitivna ovojnica)
+    :param walkers: int - stevilo sprehajalcev
+    :param mixing: int - stevilo korakov verige po vsaki dodani primerjavi
+    :param burn_in: int - stevilo korakov verige pred prvo primerjavo
+    :param seed: int - seme generatorja nakljucnih stevil
+    :return: float - naravni logaritem ocene 1 / e(P) (-inf, ce nobeden od sprehajalcev ne ustreza primerjavi)
+    """
+    rng = np.random.default_rng(seed)
+    less = less.copy()
+
+    # Zacetna linearna razsiritev: elementi, urejeni po stevilu manjsih elementov. Ista razsiritev doloca tudi
+    # zaporedje in smer primerjav, zato je neodvisno od sprehajalcev.
+    order = np.argsort(less.sum(axis=0), kind="stable")
+    # Manjsi celostevilski tip pohitri mesanje
+    L = np.tile(order.astype(np.int16), (walkers, 1))
+    _mix(L, less, burn_in, rng)
+
+    log_ratio = 0.0
+    for x, y in _comparisons(order):
+        if less[x, y]:
+            continue
+
+        before = (L == x).argmax(axis=1) < (L == y).argmax(axis=1)
+        if not before.any():
+            return -math.inf
+        log_ratio += math.log(before.mean())
+
+        # Dodamo x < y in tranzitivno ovojnico: vsi elementi pod x (vkljucno) so manjsi od vseh nad y (vkljucno)
+        below = less[:, x].copy()
+        below[x] = True
+        above = less[y].copy()
+        above[y] = True
+        less |= np.outer(below, above)
+
+        # Sprehajalce ponovno vzorcimo med ustreznimi in jih premesamo
+        L = L[rng.choice(np.flatnonzero(before), walkers)]
+        _mix(L, less, mixing, rng)
+    return log_ratio
+
+
+def _summarize(estimates, z):
+    """
+    Funkcija, ki iz logaritmov neodvisnih ocen 1 / e(P) izracuna logaritem ocene e(P) in polovico sirine intervala
+    zaupanja zanj. Ocene 1 / e(P) so nepristranske, zato povprecimo njih (in ne logaritmov, katerih povprecje je
+    pristransko navzdol) in povprecje obrnemo. Pristranskost logaritma povprecja popravimo do drugega reda natancno,
+    interval pa dolocimo z delta metodo.
+    :param estimates: float list - logaritmi ocen 1 / e(P), vsaj dva
+    :param z: float - kvantil standardne normalne porazdelitve
+    :return: (float, float) - logaritem ocene e(P) in polovica sirine intervala zaupanja zanj
+    """
+    estimates = np.array(estimates)
+    shift = estimates.max()
+    if not np.isfinite(shift):
+        raise ValueError("Nobena populacija ni ocenila vseh delezev, povecajte stevilo sprehajalcev")
+    # Ocene pred povprecenjem delimo z najvecjo, da se izognemo podkoracitvi
+    values = np.exp(estimates - shift)
+    mean = values.mean()
+    relative = values.std(ddof=1) / mean / math.sqrt(len(values))
+    return -(shift + math.log(mean)) - relative ** 2 / 2, z * relative
+
+
+def _estimate_worker(args):
+    return _estimate(*args)
+
+
+def approximate_count(partial_order, epsilon=0.1, confidence=0.95, walkers=1000, mixing=None, burn_in=None,
+                      replicates=None, max_replicates=256, processes=None, seed=None):
+    """
+    Priblizno stetje linearnih razsiritev. Neodvisne populacije sprehajalcev (vsaka da svojo nepristransko oceno
+    1 / e(P), glej _estimate) tecejo v locenih procesih; dodajamo jih, dokler interval zaupanja ni dovolj ozek, da je
+    relativna napaka ocene z zeleno zanesljivostjo najvec epsilon (ali dokler ne dosezemo max_replicates).
+    :param partial_order: networkx.DiGraph ali relations.Poset - vozlisca so mnozice tock, povezava u -> v pomeni, da
+                          je u < v
+    :param epsilon: float - dovoljena relativna napaka
+    :param confidence: float - zanesljivost intervala zaupanja
+    :param walkers: int - stevilo sprehajalcev v eni populaciji
+    :param mixing: int - stevilo korakov verige (glej _mix) po vsaki dodani primerjavi, privzeto n
+    :param burn_in: int - stevilo korakov verige pred prvo primerjavo, privzeto n^2
+    :param replicates: int - stevilo populacij v prvem krogu (vsaj 2, da lahko ocenimo razprsenost), privzeto
+                       max(16, processes); pri manj populacijah je ocena razprsenosti prevec negotova za zanesljivo
+                       zaustavitev
+    :param max_replicates: int - najvecje stevilo populacij (vsaj replicates)
+    :param processes: int - stevilo procesov, None pomeni stevilo jeder
+    :param seed: int - seme generatorja nakljucnih stevil
+    :return: (float, (float, float)) - ocena stevila linearnih razsiritev in interval zaupanja
+    """
+    n = partial_order.order()
+    if n <= 1:
+        return 1.0, (1.0, 1.0)
+    if processes is None:
+        processes = os.cpu_count()
+    if mixing is None:
+        mixing = n
+    if burn_in is None:
+        burn_in = n * n
+    if replicates is None:
+        replicates = max(16, processes)
+    # Za standardni odklon potrebujemo vsaj dve oceni
+    replicates = max(replicates, 2)
+    max_replicates = max(max_replicates, replicates)
+
+    less = get_less_matrix(partial_order)
+
+    z = NormalDist().inv_cdf((1 + confidence) / 2)
+    target = math.log(1 + epsilon)
+    seeds = np.random.SeedSequence(seed)
+    estimates = []
+
+    pool = mp.Pool(processes) if processes > 1 else None
+    try:
+        batch = replicates
+        while batch > 0:
+            args = [(less, walkers, mixing, burn_in, s.generate_state(1)[0]) for s in seeds.spawn(batch)]
+            estimates += pool.map(_estimate_worker, args) if pool is not None else list(map(_estimate_worker, args))
+
+            # Potrebno stevilo populacij ocenimo iz razprsenosti dosedanjih ocen
+            _, half_width = _summarize(estimates, z)
+            needed = math.ceil(len(estimates) * (half_width / target) ** 2)
+            batch = min(max(needed, len(estimates)), max_replicates) - len(estimates)
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+
+    log_count, half_width = _summarize(estimates, z)
+    return math.exp(log_count), (math.exp(log_count - half_width), math.exp(log_count + half_width))
+
+
+if __name__ == "__main__":
+    from data_preparation import create_graph
+
+    # Uporaba: python approximate.py ../data/vhod_80_1.txt [epsilon]
+    g = create_graph(sys.argv[1])
+    epsilon = float(sys.argv[2]) if len(sys.argv) > 2 else 0.1
+    estimate, (lower, upper) = approximate_count(g, epsilon)
+    print(f"{estimate:.6e} [{lower:.6e}, {upper:.6e}]")
@@ -0,0 +1,236 @@
+import gc
+import os
+import csv
+import sys
+import glob
+import json
+import math
+import time
+import argparse
+import numpy as np
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+from data_preparation import create_graph, read_size
+from algorithms import divide_and_conquer, bitmask_divide_and_conquer, meet_in_the_middle, paper_algorithm
+from scheduler import run_jobs
+from vectorized import vectorized_count
+from chains import chain_count
+
+
+def paper_without_triplets(partial_order):
+    return paper_algorithm(partial_order, triplets=False)
+
+
+# Algoritmi, ki jih lahko izberemo po imenu
+ALGORITHMS = {
+    "divide": divide_and_conquer,
+    "bitmask": bitmask_divide_and_conquer,
+    "meet": meet_in_the_middle,
+    "vectorized": vectorized_count,
+    "chains": chain_count,
+    "paper": paper_without_triplets,
+    "paper_triplets": paper_algorithm,
+}
+
+
+def measure(partial_order, algorithm, repeats=100, warmup=1, disable_gc=True):
+    """
+    Funkcija, ki izmeri cas izvajanja algoritma s perf_counter_ns. Pred meritvami algoritem nekajkrat izvede brez
+    merjenja, med meritvami pa lahko izklopi cistilca pomnilnika, da ta ne popaci posameznih casov.
+    :param partial_order: networkx.DiGraph - delna urejenost, kot jo vrne funkcija create_graph
+    :param algorithm: function - algoritem za stetje linearnih razsiritev
+    :param repeats: int - stevilo meritev
+    :param warmup: int - stevilo izvajanj pred meritvami
+    :param disable_gc: bool - ali med meritvami izklopimo cistilca pomnilnika
+    :return: (1D numpy array, result) - casi izvajanja v nanosekundah in rezultat zadnjega klica algoritma
+    """
+    result = None
+    for _ in range(warmup):
+        result = algorithm(partial_order)
+
+    times = np.empty(repeats, dtype=np.int64)
+    gc_enabled = gc.isenabled()
+    if disable_gc:
+        gc.collect()
+        gc.disable()
+    try:
+        for i in range(repeats):
+            start = time.perf_counter_ns()
+            result = algorithm(partial_order)
+            times[i] = time.perf_counter_ns() - start
+    finally:
+        if gc_enabled:
+            gc.enable()
+
+    return times, result
+
+
+def peak_rss_kb():
+    """
+    Funkcija, ki vrne najvecjo porabo pomnilnika trenutnega procesa v kilobajtih
+    """
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Na macOS je ru_maxrss v bajtih
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+def get_corpus(pattern='../data/vhod_*.txt', max_n=None):
+    """
+    Funkcija, ki vrne urejen seznam vhodnih datotek, ki ustrezajo vzorcu in imajo najvec max_n elementov
+    :param pattern: String - glob vzorec vhodnih datotek
+    :param max_n: int - najvecja velikost mnozice, None pomeni brez omejitve
+    :return: String list - poti do datotek
+    """
+    return [path for path in sorted(glob.glob(pattern)) if max_n is None or read_size(path) <= max_n]
+
+
+def run_benchmark(paths, algorithms, output, repeats=100, warmup=1, disable_gc=True, timeout=None):
+    """
+    Funkcija, ki vsak algoritem izmeri na vsaki datoteki korpusa in zapise po en zapis za vsak par. Vsak par tece v
+    svojem procesu, pripetem na eno jedro, zato je najvecja poraba pomnilnika izmerjena za posamezen par.
+    :param paths: String list - poti do vhodnih datotek
+    :param algorithms: String list - imena algoritmov iz ALGORITHMS
+    :param output: String - pot do izhodne datoteke (.jsonl ali .csv)
+    :param repeats: int - stevilo meritev
+    :param warmup: int - stevilo izvajanj pred meritvami
+    :param disable_gc: bool - ali med meritvami izklopimo cistilca pomnilnika
+    :param timeout: float - najdaljsi cas za par v sekundah
+    :return: list of dictionaries - zapisi meritev
+    """
+    def execute(job):
+        g = create_graph(job["path"])
+        times, result = measure(g, ALGORITHMS[job["algorithm"]], repeats, warmup, disable_gc)
+        count = result[0] if isinstance(result, tuple) else result
+        return {"status": "ok", "n": g.number_of_nodes(), "m": g.number_of_edges(), "count": str(count),
+                "times_ns": times.tolist(), "peak_rss_kb": peak_rss_kb()}
+
+    jobs = [{"instance": os.path.basename(path), "path": path, "algorithm": algorithm}
+            for path in paths for algorithm in algorithms]
+    records = run_jobs(jobs, execute, processes=1, timeout=timeout)
+    for record in records:
+        del record["path"]
+    save_records(records, output)
+    return records
+
+
+def save_records(records, path):
+    """
+    Funkcija, ki zapise meritve v datoteko. V formatu .csv je vsaka meritev v svoji vrstici, sicer je vsak zapis ena
+    vrstica JSON.
+    """
+    if path.endswith(".csv"):
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["instance", "algorithm", "status", "n", "m", "repeat", "time_ns", "peak_rss_kb"])
+            for r in records:
+                for i, t in enumerate(r.get("times_ns", [])):
+                    writer.writerow([r["instance"], r["algorithm"], r["status"], r.get("n"), r.get("m"), i, t,
+                                     r.get("peak_rss_kb")])
+    else:
+        with open(path, "w") as f:
+            for r in records:
+                f.write(json.dumps(r) + "\n")
+
+
+def load_records(path):
+    """
+    Funkcija, ki prebere meritve, kot jih zapise save_records
+    :return: dictionary - (instance, algorithm) -> 1D numpy array casov v nanosekundah
+    """
+    times = dict()
+    if path.endswith(".csv"):
+        with open(path, newline="") as f:
+            for row in csv.DictReader(f):
+                times.setdefault((row["instance"], row["algorithm"]), []).append(int(row["time_ns"]))
+    else:
+        with open(path) as f:
+            for line in f:
+                r = json.loads(line)
+                if r["status"] == "ok":
+                    times[(r["instance"], r["algorithm"])] = r["times_ns"]
+    return {key: np.array(value) for key, value in times.items()}
+
+
+def mann_whitney(x, y):
+    """
+    Funkcija, ki izracuna dvostransko p-vrednost Mann-Whitneyjevega testa z normalno aproksimacijo
+    :return: float - p-vrednost
+    """
+    n1, n2 = len(x), len(y)
+    values = np.concatenate((x, y))
+    order = np.argsort(values, kind="mergesort")
+    ranks = np.empty(len(values))
+    ranks[order] = np.arange(1, len(values) + 1)
+    # Enakim vrednostim dodelimo povprecen rang
+    unique, inverse, counts = np.unique(values, return_inverse=True, return_counts=True)
+    ranks = (np.bincount(inverse, weights=ranks) / counts)[inverse]
+
+    u = ranks[:n1].sum() - n1 * (n1 + 1) / 2
+    n = n1 + n2
+    ties = np.sum(counts ** 3 - counts)
+    sigma = math.sqrt(n1 * n2 / 12 * ((n + 1) - ties / (n * (n - 1))))
+    if sigma == 0:
+        return 1.0
+    z = (u - n1 * n2 / 2) / sigma
+    return math.erfc(abs(z) / math.sqrt(2))
+
+
+def compare(old_path, new_path, alpha=0.01, threshold=0.05):
+    """
+    Funkcija, ki primerja dve datoteki meritev. Razlika je znacilna, ce je p-vrednost Mann-Whitneyjevega testa manjsa
+    od alpha in se mediana spremeni za vec kot threshold.
+    :param old_path: String - datoteka z osnovnimi meritvami
+    :param new_path: String - datoteka z novimi meritvami
+    :return: list of dictionaries - primerjava za vsak par (instance, algorithm), ki je v obeh datotekah
+    """
+    old = load_records(old_path)
+    new = load_records(new_path)
+    comparison = []
+    for key in sorted(old.keys() & new.keys()):
+        ratio = np.median(new[key]) / np.median(old[key])
+        p = mann_whitney(old[key], new[key])
+        verdict = "ok"
+        if p < alpha and ratio > 1 + threshold:
+            verdict = "regression"
+        elif p < alpha and ratio < 1 - threshold:
+            verdict = "improvement"
+        comparison.append({"instance": key[0], "algorithm": key[1], "ratio": ratio, "p": p, "verdict": verdict})
+    return comparison
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Merjenje casa izvajanja algoritmov na korpusu iz mape data")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subparsers.add_parser("run")
+    run_parser.add_argument("output")
+    run_parser.add_argument("--pattern", default="../data/vhod_*.txt")
+    run_parser.add_argument("--max-n", type=int, default=20)
+    run_parser.add_argument("--algorithms", nargs="+", default=list(ALGORITHMS), choices=list(ALGORITHMS))
+    run_parser.add_argument("--repeats", type=int, default=100)
+    run_parser.add_argument("--warmup", type=int, default=1)
+    run_parser.add_argument("--keep-gc", action="store_true")
+    run_parser.add_argument("--timeout", type=float, default=None)
+
+    compare_parser = subparsers.add_parser("compare")
+    compare_parser.add_argument("old")
+    compare_parser.add_argument("new")
+    compare_parser.add_argument("--alpha", type=float, default=0.01)
+    compare_parser.add_argument("--threshold", type=float, default=0.05)
+
+    args = parser.parse_args()
+    if args.command == "run":
+        run_benchmark(get_corpus(args.pattern, args.max_n), args.algorithms, args.output, args.repeats, args.warmup,
+                      not args.keep_gc, args.timeout)
+    else:
+        results = compare(args.old, args.new, args.alpha, args.threshold)
+        for r in results:
+            print(f"{r['instance']:28} {r['algorithm']:15} {r['ratio']:7.3f} p={r['p']:.2e} {r['verdict']}")
+        # Izhodna koda 1 pomeni, da smo nasli vsaj eno znacilno poslabsanje
+        sys.exit(int(any(r["verdict"] == "regression" for r in results)))
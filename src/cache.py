@@ -0,0 +1,154 @@
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import networkx as nx
+from networkx.algorithms.isomorphism import DiGraphMatcher
+
+from relations import get_closure_bitmasks, get_bit_indices
+
+
+class Fingerprint:
+    """
+    Prstni odtis delne urejenosti, neodvisen od oznak vozlisc. Barve vozlisc dobimo z barvnim izboljsevanjem (barva
+    elementa je odvisna od barv vseh manjsih in vseh vecjih elementov), odtis je zgostitev barv in primerjav med
+    barvami. Vozlisca uredimo po barvi; ce so vse barve razlicne, je ta ureditev kanonicna, sicer pri iskanju v
+    predpomnilniku izomorfnost preverimo posebej.
+    """
+
+    def __init__(self, partial_order):
+        """
+        :param partial_order: networkx.DiGraph - vozlisca so mnozice tock, povezava u -> v pomeni, da je u < v
+        """
+        labels, down, up = get_closure_bitmasks(partial_order)
+        n = len(labels)
+        down_lists = [get_bit_indices(mask) for mask in down]
+        up_lists = [get_bit_indices(mask) for mask in up]
+
+        colors = [0] * n
+        n_colors = 1
+        while True:
+            signatures = [(colors[i], tuple(sorted(colors[j] for j in down_lists[i])),
+                           tuple(sorted(colors[j] for j in up_lists[i]))) for i in range(n)]
+            ranks = {signature: rank for rank, signature in enumerate(sorted(set(signatures)))}
+            colors = [ranks[signature] for signature in signatures]
+            if len(ranks) == n_colors:
+                break
+            n_colors = len(ranks)
+
+        # Vozlisca preimenujemo po barvi, povezave so primerjave tranzitivne ovojnice
+        order = sorted(range(n), key=lambda i: colors[i])
+        position = {i: p for p, i in enumerate(order)}
+        self.n = n
+        self.colors = [colors[i] for i in order]
+        self.edges = sorted((position[i], position[j]) for i in range(n) for j in up_lists[i])
+        self.discrete = n_colors == n
+
+        summary = (n, self.colors, sorted((self.colors[u], self.colors[v]) for u, v in self.edges))
+        self.digest = hashlib.sha256(repr(summary).encode()).hexdigest()
+
+    def matches(self, colors, edges):
+        """
+        Funkcija, ki preveri, ali shranjen kanonicni zapis predstavlja delno urejenost, izomorfno tej
+        :param colors: int list - barve shranjenih vozlisc
+        :param edges: list of pairs - shranjene primerjave
+        :return: bool
+        """
+        if self.discrete:
+            return self.colors == colors and self.edges == edges
+
+        def as_graph(node_colors, node_edges):
+            g = nx.DiGraph()
+            g.add_nodes_from((i, {"color": c}) for i, c in enumerate(node_colors))
+            g.add_edges_from(node_edges)
+            return g
+
+        matcher = DiGraphMatcher(as_graph(self.colors, self.edges), as_graph(colors, edges),
+                                 node_match=lambda a, b: a["color"] == b["color"])
+        return matcher.is_isomorphic()
+
+
+class CountCache:
+    """
+    Trajni predpomnilnik rezultatov v sqlite datoteki. Kljuc je prstni odtis delne urejenosti in ime algoritma, shrani
+    pa se stevilo linearnih razsiritev, indikator large matching primera, velikost mnozice A in casi izvajanja.
+    Indikator in velikost A sta odvisna od oznak vozlisc, zato se shranita za prvo izracunano oznacitev.
+    """
+
+    def __init__(self, path):
+        """
+        :param path: String - pot do sqlite datoteke
+        """
+        self.path = path
+        self.connection = None
+        self.pid = None
+
+    def _connect(self):
+        # Vsak proces (tudi otrok po fork) potrebuje svojo povezavo
+        if self.connection is None or self.pid != os.getpid():
+            self.connection = sqlite3.connect(self.path, timeout=60)
+            self.pid = os.getpid()
+            self.connection.execute("CREATE TABLE IF NOT EXISTS counts (fingerprint TEXT, algorithm TEXT, "
+                                    "colors TEXT, edges TEXT, count TEXT, large_case INTEGER, A_size INTEGER, "
+                                    "times TEXT)")
+            self.connection.execute("CREATE INDEX IF NOT EXISTS counts_key ON counts (fingerprint, algorithm)")
+        return self.connection
+
+    def lookup(self, fingerprint, algorithm):
+        """
+        Funkcija, ki poisce shranjen rezultat za delno urejenost
+        :param fingerprint: Fingerprint - prstni odtis delne urejenosti
+        :param algorithm: String - ime algoritma
+        :return: dictionary ali None - count, large_case, A_size in times
+        """
+        rows = self._connect().execute("SELECT colors, edges, count, large_case, A_size, times FROM counts "
+                                       "WHERE fingerprint = ? AND algorithm = ?", (fingerprint.digest, algorithm))
+        for colors, edges, count, large_case, A_size, times in rows:
+            edges = [tuple(edge) for edge in json.loads(edges)]
+            if fingerprint.matches(json.loads(colors), edges):
+                return {"count": int(count), "large_case": None if large_case is None else bool(large_case),
+                        "A_size": A_size, "times": json.loads(times)}
+        return None
+
+    def store(self, fingerprint, algorithm, count, large_case=None, A_size=None, times=()):
+        """
+        Funkcija, ki shrani rezultat algoritma za delno urejenost
+        """
+        connection = self._connect()
+        connection.execute("INSERT INTO counts VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                           (fingerprint.digest, algorithm, json.dumps(fingerprint.colors),
+                            json.dumps(fingerprint.edges), str(count), large_case, A_size, json.dumps(list(times))))
+        connection.commit()
+
+
+def cached(algorithm, cache, name=None):
+    """
+    Funkcija, ki algoritem ovije tako, da rezultat najprej poisce v predpomnilniku in ga po izracunu shrani. Za
+    merjenje casa izvajanja algoritem klicemo neposredno.
+    :param algorithm: function - divide_and_conquer, paper_algorithm ali drug algoritem za stetje
+    :param cache: CountCache - predpomnilnik
+    :param name: String - ime algoritma v predpomnilniku, privzeto ime funkcije
+    :return: function - algoritem z enakim rezultatom kot podani
+    """
+    if name is None:
+        name = algorithm.__name__
+
+    def wrapped(partial_order):
+        fingerprint = Fingerprint(partial_order)
+        entry = cache.lookup(fingerprint, name)
+        if entry is not None:
+            if entry["large_case"] is None:
+                return entry["count"]
+            return entry["count"], entry["large_case"], entry["A_size"]
+
+        start = time.perf_counter()
+        result = algorithm(partial_order)
+        seconds = time.perf_counter() - start
+        if isinstance(result, tuple):
+            cache.store(fingerprint, name, result[0], result[1], result[2], [seconds])
+        else:
+            cache.store(fingerprint, name, result, times=[seconds])
+        return result
+
+    return wrapped
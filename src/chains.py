@@ -0,0 +1,103 @@
+import math
+import networkx as nx
+
+from relations import get_closure_bitmasks
+
+
+def get_chain_decomposition(partial_order):
+    """
+    Funkcija, ki delno urejenost razbije na najmanjse stevilo verig (Dilworthov izrek). Najvecje prirejanje v
+    dvodelnem grafu, kjer je levi u povezan z desnim v, ce je u < v, doloci naslednika v verigi; verig je n minus
+    velikost prirejanja, kar je enako sirini delne urejenosti.
+    :param partial_order: networkx.DiGraph - vozlisca so mnozice tock, povezava u -> v pomeni, da je u < v
+    :return: (labels, down, chains) - seznam vozlisc, maske manjsih elementov (tranzitivna ovojnica) in seznam verig,
+             vsaka veriga je seznam indeksov vozlisc v narascajocem vrstnem redu
+    """
+    labels, down, up = get_closure_bitmasks(partial_order)
+    n = len(labels)
+
+    bipartite = nx.Graph()
+    left = [("l", i) for i in range(n)]
+    bipartite.add_nodes_from(left)
+    bipartite.add_nodes_from(("r", i) for i in range(n))
+    for i in range(n):
+        mask = up[i]
+        while mask:
+            bit = mask & -mask
+            mask ^= bit
+            bipartite.add_edge(("l", i), ("r", bit.bit_length() - 1))
+    matching = nx.bipartite.hopcroft_karp_matching(bipartite, top_nodes=left)
+
+    # Verige zacnemo v elementih, ki niso naslednik nobenega elementa, in sledimo prirejenim naslednikom
+    chains = []
+    for i in range(n):
+        if ("r", i) in matching:
+            continue
+        chain = [i]
+        while ("l", chain[-1]) in matching:
+            chain.append(matching[("l", chain[-1])][1])
+        chains.append(chain)
+    return labels, down, chains
+
+
+def chain_count(partial_order, stats=None):
+    """
+    Stetje linearnih razsiritev z dinamicnim programiranjem po verigah najmanjse verizne dekompozicije. Ideal je
+    dolocen z dolzinami zacetnih kosov verig (c_1, ..., c_w), ki jih vsebuje, zato stevila hranimo v gosti tabeli
+    velikosti (|C_1| + 1) * ... * (|C_w| + 1) z mesanimi osnovami brez razprsenih tabel. Tabelo polnimo po narascajocih
+    indeksih: naslednji element verige i lahko dodamo, ce ideal vsebuje vse njegove manjse elemente, torej na vsaki
+    verigi j vsaj toliko elementov, kolikor jih je na njej manjsih od njega. Cas je O(n * w * prod |C_i|), zato je
+    primeren za ozke delne urejenosti.
+    :param partial_order: networkx.DiGraph - vozlisca so mnozice tock, povezava u -> v pomeni, da je u < v
+    :param stats: dictionary - stevci instrumentacije (Instrumentation.counters), None pomeni brez stetja
+    :return: Stevilo linearnih razsiritev
+    """
+    if partial_order.order() <= 1:
+        return 1
+
+    _, down, chains = get_chain_decomposition(partial_order)
+    w = len(chains)
+    sizes = [len(chain) for chain in chains]
+    chain_masks = [sum(1 << x for x in chain) for chain in chains]
+    # conditions[i][p] so pari (j, k): p-ti element verige i potrebuje vsaj k elementov verige j
+    conditions = [[[(j, bin(down[x] & chain_masks[j]).count("1")) for j in range(w)
+                    if j != i and down[x] & chain_masks[j]] for x in chain] for i, chain in enumerate(chains)]
+
+    strides = [1] * w
+    for i in range(1, w):
+        strides[i] = strides[i - 1] * (sizes[i - 1] + 1)
+    total = math.prod(size + 1 for size in sizes)
+
+    counts = [0] * total
+    counts[0] = 1
+    cut = [0] * w
+    for index in range(total):
+        count = counts[index]
+        if count:
+            branches = 0
+            for i in range(w):
+                p = cut[i]
+                if p == sizes[i]:
+                    continue
+                for j, k in conditions[i][p]:
+                    if cut[j] < k:
+                        break
+                else:
+                    counts[index + strides[i]] += count
+                    branches += 1
+            if stats is not None:
+                stats["states"] += 1
+                stats["branches"] += branches
+                stats["max_branches"] = max(stats["max_branches"], branches)
+
+        # Naslednji indeks v mesanih osnovah
+        i = 0
+        while i < w and cut[i] == sizes[i]:
+            cut[i] = 0
+            i += 1
+        if i < w:
+            cut[i] += 1
+
+    if stats is not None:
+        stats["peak_memo"] = max(stats["peak_memo"], total)
+    return counts[-1]
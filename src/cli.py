@@ -0,0 +1,95 @@
+import os
+import sys
+import argparse
+
+
+# Algoritmi, ki jih lahko izberemo po imenu; moduli se uvozijo sele ob prvem stetju
+ALGORITHMS = ["auto", "bitmask", "chains", "divide", "meet", "paper", "paper_triplets", "vectorized"]
+
+
+def get_algorithm(name, decomposition=False):
+    """
+    Funkcija, ki uvozi in vrne algoritem za stetje. Uvozimo le module za stetje (brez pandas in matplotlib).
+    :param name: String - ime algoritma iz ALGORITHMS; auto izbere strategijo z modelom casov (planner.Planner)
+    :param decomposition: bool - ali delno urejenost najprej razbijemo na nerazcepne kose (auto jo razbije vedno)
+    :return: function - algoritem, ki sprejme relations.Poset in vrne stevilo linearnih razsiritev
+    """
+    if name == "auto":
+        from planner import Planner
+        return Planner.load()
+
+    from algorithms import divide_and_conquer, bitmask_divide_and_conquer, meet_in_the_middle, paper_algorithm
+    from decomposition import decomposed
+    from vectorized import vectorized_count
+    from chains import chain_count
+
+    counters = {"bitmask": bitmask_divide_and_conquer, "chains": chain_count, "divide": divide_and_conquer,
+                "meet": meet_in_the_middle, "vectorized": vectorized_count}
+    if name in counters:
+        return decomposed(counters[name]) if decomposition else counters[name]
+
+    triplets = name == "paper_triplets"
+
+    def paper(partial_order):
+        return paper_algorithm(partial_order, triplets=triplets, decomposition=decomposition)[0]
+    return paper
+
+
+def count_instance(algorithm, n, edges):
+    """
+    Funkcija, ki iz primerjav ustvari delno urejenost in presteje linearne razsiritve
+    """
+    from relations import Poset
+    return algorithm(Poset.from_edges(n, edges))
+
+
+def serve(algorithm, requests=sys.stdin, responses=sys.stdout):
+    """
+    Funkcija, ki odgovarja na zahteve vrstico za vrstico, dokler se vhod ne konca. Zahteva je pot do vhodne datoteke
+    ali primer v eni vrstici (glej data_preparation.parse_instance), odgovor pa stevilo linearnih razsiritev ali
+    sporocilo o napaki, ki se zacne z "napaka:". Po vsakem odgovoru izhod izpraznimo, da ga klicatelj takoj prejme.
+    """
+    from data_preparation import read_edges, parse_instance
+
+    for line in requests:
+        request = line.strip()
+        if not request:
+            continue
+        try:
+            n, edges = read_edges(request) if os.path.exists(request) else parse_instance(request)
+            response = str(count_instance(algorithm, n, edges))
+        except Exception as e:
+            response = f"napaka: {e!r}"
+        responses.write(response + "\n")
+        responses.flush()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Stetje linearnih razsiritev delnih urejenosti")
+    parser.add_argument("paths", nargs="*", help="vhodne datoteke; - ali nic pomeni zaporedne primere na stdin")
+    parser.add_argument("-a", "--algorithm", default="bitmask", choices=ALGORITHMS)
+    parser.add_argument("-d", "--decomposition", action="store_true")
+    parser.add_argument("--serve", action="store_true",
+                        help="odgovarjaj na zahteve (pot ali primer v eni vrstici) s stdin vrstico za vrstico")
+    args = parser.parse_args(argv)
+
+    algorithm = get_algorithm(args.algorithm, args.decomposition)
+    if args.serve:
+        serve(algorithm)
+    elif not args.paths or args.paths == ["-"]:
+        from data_preparation import read_instances
+        try:
+            for n, edges in read_instances(sys.stdin):
+                print(count_instance(algorithm, n, edges), flush=True)
+        except ValueError as e:
+            # Nepopoln zadnji primer sporocimo enako kot serve, ze izpisani odgovori ostanejo veljavni
+            print(f"napaka: {e!r}", flush=True)
+            sys.exit(1)
+    else:
+        from data_preparation import read_edges
+        for path in args.paths:
+            print(path, count_instance(algorithm, *read_edges(path)), flush=True)
+
+
+if __name__ == "__main__":
+    main()
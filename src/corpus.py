@@ -0,0 +1,129 @@
+import os
+import numpy as np
+
+from data_preparation import read_edges, edges_to_graph
+from relations import Poset
+
+
+# Glava datoteke: oznaka formata, stevilo primerov ter polozaj in dolzina imen primerov
+MAGIC = b'LINEXT01'
+HEADER = np.dtype([('magic', 'S8'), ('count', '<i8'), ('names_offset', '<i8'), ('names_length', '<i8')])
+# Zapis v indeksu: velikost mnozice, stevilo primerjav in polozaj primerjav (v bajtih od zacetka datoteke)
+INDEX = np.dtype([('n', '<i8'), ('m', '<i8'), ('offset', '<i8')])
+
+
+def pack_corpus(paths, output):
+    """
+    Funkcija, ki vec vhodnih datotek zapakira v eno binarno datoteko. Datoteko sestavljajo glava, indeks z zapisom za
+    vsak primer, primerjave vseh primerov kot zaporedje parov int32 (indeksirano z 1, urejeno po u in nato po v) in
+    na koncu imena primerov, locena z novo vrstico.
+    :param paths: String list - poti do vhodnih datotek (v obeh formatih)
+    :param output: String - pot do izhodne datoteke
+    :return: int - stevilo zapakiranih primerov
+    """
+    index = np.zeros(len(paths), dtype=INDEX)
+    offset = HEADER.itemsize + index.nbytes
+    blocks = []
+    for i, path in enumerate(paths):
+        n, edges = read_edges(path)
+        edges = edges[np.lexsort((edges[:, 1], edges[:, 0]))]
+        index[i] = (n, len(edges), offset)
+        blocks.append(edges)
+        offset += edges.nbytes
+
+    names = '\n'.join(os.path.basename(path) for path in paths).encode()
+    header = np.array([(MAGIC, len(paths), offset, len(names))], dtype=HEADER)
+    with open(output, 'wb') as f:
+        f.write(header.tobytes())
+        f.write(index.tobytes())
+        for edges in blocks:
+            f.write(edges.tobytes())
+        f.write(names)
+    return len(paths)
+
+
+class Corpus:
+    """
+    Korpus vhodnih primerov, zapakiran s pack_corpus. Datoteka je preslikana v pomnilnik, zato odpiranje ne prebere
+    primerjav, tabele primerjav pa so pogledi na preslikano datoteko brez kopiranja. Graf networkx ustvarimo le, ko ga
+    zahtevamo z graph.
+    """
+
+    def __init__(self, path):
+        """
+        :param path: String - pot do datoteke, ustvarjene s pack_corpus
+        """
+        self.path = path
+        self.buffer = np.memmap(path, dtype=np.uint8, mode='r')
+        header = self.buffer[:HEADER.itemsize].view(HEADER)[0]
+        if header['magic'] != MAGIC:
+            raise ValueError(f"{path} ni zapakiran korpus")
+
+        count = int(header['count'])
+        self.index = self.buffer[HEADER.itemsize:HEADER.itemsize + count * INDEX.itemsize].view(INDEX)
+        start = int(header['names_offset'])
+        names = bytes(self.buffer[start:start + int(header['names_length'])]).decode()
+        self.names = names.split('\n') if count else []
+        self.positions = {name: i for i, name in enumerate(self.names)}
+
+    def __len__(self):
+        return len(self.names)
+
+    def __contains__(self, name):
+        return name in self.positions
+
+    def __iter__(self):
+        """
+        Primere vraca enega za drugim kot trojice (ime, n, primerjave)
+        """
+        for i, name in enumerate(self.names):
+            yield name, self.size(i), self.edges(i)
+
+    def _position(self, key):
+        # Primer lahko izberemo z zaporedno stevilko ali z imenom datoteke (npr. vhod_10_1.txt)
+        return self.positions[os.path.basename(key)] if isinstance(key, str) else key
+
+    def size(self, key):
+        """
+        Funkcija, ki vrne velikost mnozice primera
+        """
+        return int(self.index[self._position(key)]['n'])
+
+    def edges(self, key):
+        """
+        Funkcija, ki vrne primerjave primera
+        :param key: int ali String - zaporedna stevilka ali ime primera
+        :return: 2D numpy array oblike (m, 2) - primerjave u v (u < v, indeksirano z 1), pogled na datoteko
+        """
+        entry = self.index[self._position(key)]
+        start = int(entry['offset'])
+        return self.buffer[start:start + int(entry['m']) * 8].view(np.int32).reshape(-1, 2)
+
+    def adjacency(self, key):
+        """
+        Funkcija, ki vrne primerjave v stisnjeni obliki: nasledniki elementa u (indeksirano z 0) so
+        indices[indptr[u]:indptr[u + 1]]
+        :param key: int ali String - zaporedna stevilka ali ime primera
+        :return: (1D numpy array, 1D numpy array) - indptr dolzine n + 1 in indices dolzine m
+        """
+        n = self.size(key)
+        edges = self.edges(key)
+        indptr = np.searchsorted(edges[:, 0], np.arange(1, n + 2))
+        return indptr, edges[:, 1] - 1
+
+    def graph(self, key, reduction=False):
+        """
+        Funkcija, ki primer pretvori v usmerjen graf, kot ga vrne create_graph
+        :param key: int ali String - zaporedna stevilka ali ime primera
+        :param reduction: boolean - ali vrnemo le pokritja (tranzitivno redukcijo)
+        :return: networkx.DiGraph - usmerjen graf, v katerem povezava u -> v pomeni, da je u < v
+        """
+        return edges_to_graph(self.size(key), self.edges(key), reduction)
+
+    def poset(self, key):
+        """
+        Funkcija, ki primer pretvori v relations.Poset, kot ga vrne data_preparation.read_poset
+        :param key: int ali String - zaporedna stevilka ali ime primera
+        :return: relations.Poset
+        """
+        return Poset.from_edges(self.size(key), self.edges(key))
@@ -1,8 +1,47 @@
 import numpy as np
 import networkx as nx
 
+from relations import Poset, transitive_reduction
 
-def generate_data(set_sizes, n_sets, seed):
+
+def get_comparabilities(p1, p2):
+    """
+    Funkcija, ki iz realizatorja (dveh permutacij) vektorsko izracuna vse primerljive pare. Element u je manjsi od v,
+    ce je p1[u] < p1[v] in p2[u] < p2[v].
+    :param p1: 1D numpy array - prva permutacija
+    :param p2: 1D numpy array - druga permutacija
+    :return: 2D numpy array oblike (m, 2) - pari (u, v), u < v, urejeni po u in nato po v (indeksirani z 0)
+    """
+    p1 = np.asarray(p1)
+    p2 = np.asarray(p2)
+    less = (p1[:, None] < p1[None, :]) & (p2[:, None] < p2[None, :])
+    return np.argwhere(less)
+
+
+def write_instance(path, n, p1, p2, compact=False):
+    """
+    Funkcija, ki primer zapise v datoteko. V obicajnem formatu je prva vrstica n m, sledi m vrstic u v (u < v,
+    indeksirano z 1). V kompaktnem formatu je prva vrstica R n, drugi in tretja vrstica pa sta permutaciji
+    realizatorja; elementi z indeksom vecjim od dolzine permutacij so vsiljena antiveriga.
+    :param path: String - pot do izhodne datoteke
+    :param n: int - velikost mnozice
+    :param p1: 1D numpy array - prva permutacija (dolzine najvec n)
+    :param p2: 1D numpy array - druga permutacija
+    :param compact: bool - ali zapisemo le realizator
+    """
+    with open(path, 'w') as f:
+        if compact:
+            f.write(f'R {n}\n')
+            f.write(' '.join(map(str, p1)) + '\n')
+            f.write(' '.join(map(str, p2)) + '\n')
+        else:
+            # Dodamo +1, da ni indeksiranja z 0
+            edges = get_comparabilities(p1, p2) + 1
+            f.write(f'{n} {len(edges)}\n')
+            f.write(''.join(f'{u} {v}\n' for u, v in edges.tolist()))
+
+
+def generate_data(set_sizes, n_sets, seed, compact=False):
     """
     Funkcija, ki generira vhodne primere (delne urejenosti reda 2) in jih shrani v datoteke v mapi data. Datoteka
     vhod_n_k.txt predstavlja k-ti testni primer za mnozico velikosti n. Format vsake vhodne datoteke je sledec. Prva
@@ -12,6 +51,7 @@ def generate_data(set_sizes, n_sets, seed):
     :param set_sizes: int list - seznam velikosti mnozic, ki jih bomo testirali
     :param n_sets: int - stevilo vhodnih primerov, ki jih generiramo za vsako mnozico
     :param seed: int - seme nakljucnega generatorja permutacij, uporabljenega za generiranje primerov
+    :param compact: bool - ali namesto primerjav zapisemo le realizator (glej write_instance)
     """
     np.random.seed(seed)
 
@@ -23,29 +63,12 @@ def generate_data(set_sizes, n_sets, seed):
             # Potrebujemo razlicni permutaciji, sicer imamo delno urejenost reda 1
             while np.all(p1 == p2):
                 p2 = np.random.permutation(n)
-            # Slovarja, ki za vsako stevilo vrneta mesto v posamezni permutaciji
-            inverse1 = {i: p1[i] for i in range(n)}
-            inverse2 = {i: p2[i] for i in range(n)}
-
-            # Gremo cez vse kombinacije, ce je eno stevilo manjse od drugega v obeh primerih, ju dodamo v delno urejenost
-            partial_order = []
-            for u in range(n):
-                for v in range(n):
-                    if inverse1[u] < inverse1[v] and inverse2[u] < inverse2[v]:
-                        partial_order.append((u, v))
 
             # Izpisemo delno urejenost v datoteko
-            f = open(f'../data/vhod_{n}_{k+1}.txt', 'w')
-            # Prva vrstica
-            f.write(f'{n} {len(partial_order)}\n')
-            # Primerljivi elementi
-            for u, v in partial_order:
-                # Dodamo +1, da ni indeksiranja z 0
-                f.write(f'{u+1} {v+1}\n')
-            f.close()
+            write_instance(f'../data/vhod_{n}_{k+1}.txt', n, p1, p2, compact)
 
 
-def generate_with_antichain(set_sizes, n_sets, antichain_sizes, seed):
+def generate_with_antichain(set_sizes, n_sets, antichain_sizes, seed, compact=False):
     """
     Funkcija, ki generira vhodne primere z vsiljenimi antiverigami (delni urejenosti doda antiverigo podane velikosti)
     in jih shrani v datoteke v mapi data. Datoteka vhod_antichain_n_k.txt predstavlja k-ti testni primer za mnozico
@@ -57,6 +80,7 @@ def generate_with_antichain(set_sizes, n_sets, antichain_sizes, seed):
     :param antichain_sizes: float list of length n_sets - velikosti vsiljenih antiverig (kot delez velikosti mnozice) za
                         posamezen generiran primer
     :param seed: int - seme nakljucnega generatorja permutacij, uporabljenega za generiranje primerov
+    :param compact: bool - ali namesto primerjav zapisemo le realizator (glej write_instance)
     """
     np.random.seed(seed)
 
@@ -69,48 +93,144 @@ def generate_with_antichain(set_sizes, n_sets, antichain_sizes, seed):
             # Potrebujemo razlicni permutaciji, sicer imamo delno urejenost reda 1
             while np.all(p1 == p2):
                 p2 = np.random.permutation(n-antichain_size)
-            # Slovarja, ki za vsako stevilo vrneta mesto v posamezni permutaciji
-            inverse1 = {i: p1[i] for i in range(n-antichain_size)}
-            inverse2 = {i: p2[i] for i in range(n-antichain_size)}
-
-            # Gremo cez vse kombinacije, ce je eno stevilo manjse od drugega v obeh primerih, ju dodamo v delno urejenost
-            partial_order = []
-            for u in range(n-antichain_size):
-                for v in range(n-antichain_size):
-                    if inverse1[u] < inverse1[v] and inverse2[u] < inverse2[v]:
-                        partial_order.append((u, v))
 
             # Izpisemo delno urejenost v datoteko
-            f = open(f'../data/vhod_antichain_{n}_{k+1}.txt', 'w')
-            # Prva vrstica
-            f.write(f'{n} {len(partial_order)}\n')
-            # Primerljivi elementi
-            for u, v in partial_order:
-                # Dodamo +1, da ni indeksiranja z 0
-                f.write(f'{u+1} {v+1}\n')
-            f.close()
+            write_instance(f'../data/vhod_antichain_{n}_{k+1}.txt', n, p1, p2, compact)
+
+
+def read_realizer(path):
+    """
+    Funkcija, ki prebere realizator iz datoteke v kompaktnem formatu
+    :param path: String - pot do vhodne datoteke
+    :return: (n, p1, p2) - velikost mnozice in permutaciji realizatorja
+    """
+    with open(path, 'r') as f:
+        n = int(f.readline().split()[1])
+        p1 = np.array(f.readline().split(), dtype=np.int64)
+        p2 = np.array(f.readline().split(), dtype=np.int64)
+    return n, p1, p2
+
+
+def is_compact(path):
+    """
+    Funkcija, ki preveri, ali je datoteka v kompaktnem formatu (prva vrstica R n)
+    """
+    with open(path, 'r') as f:
+        return f.readline().startswith('R')
+
+
+def read_size(path):
+    """
+    Funkcija, ki iz prve vrstice datoteke prebere velikost mnozice (v obeh formatih)
+    """
+    with open(path, 'r') as f:
+        first = f.readline().split()
+    return int(first[1]) if first[0] == 'R' else int(first[0])
+
+
+def expand_realizer(path, output_path):
+    """
+    Funkcija, ki datoteko v kompaktnem formatu razsiri v obicajen format s seznamom vseh primerjav
+    :param path: String - pot do datoteke v kompaktnem formatu
+    :param output_path: String - pot do izhodne datoteke
+    """
+    n, p1, p2 = read_realizer(path)
+    write_instance(output_path, n, p1, p2)
 
 
-def create_graph(path):
+def read_edges(path):
+    """
+    Funkcija, ki prebere vhodno datoteko (v obeh formatih) v tabelo primerjav
+    :param path: String - pot do vhodne datoteke
+    :return: (n, 2D numpy array oblike (m, 2)) - velikost mnozice in primerjave u v (u < v, indeksirano z 1) v vrstnem
+             redu iz datoteke
+    """
+    if is_compact(path):
+        n, p1, p2 = read_realizer(path)
+        return n, (get_comparabilities(p1, p2) + 1).astype(np.int32)
+
+    with open(path, 'r') as f:
+        values = np.array(f.read().split(), dtype=np.int32)
+    return int(values[0]), values[2:].reshape(-1, 2)
+
+
+def parse_instance(text):
+    """
+    Funkcija, ki prebere en primer iz niza v obeh formatih, pri cemer so presledki in nove vrstice zamenljivi:
+    n m u1 v1 ... um vm ali R n p1 p2 (permutaciji sta enako dolgi)
+    :param text: String - primer
+    :return: (n, 2D numpy array oblike (m, 2)) - velikost mnozice in primerjave (indeksirano z 1)
+    """
+    tokens = text.split()
+    if tokens[0] == 'R':
+        half = (len(tokens) - 2) // 2
+        p1 = np.array(tokens[2:2 + half], dtype=np.int64)
+        p2 = np.array(tokens[2 + half:], dtype=np.int64)
+        return int(tokens[1]), (get_comparabilities(p1, p2) + 1).astype(np.int32)
+
+    n, m = int(tokens[0]), int(tokens[1])
+    edges = np.array(tokens[2:], dtype=np.int32).reshape(-1, 2)
+    if len(edges) != m:
+        raise ValueError(f"Pricakovanih {m} primerjav, prebranih {len(edges)}")
+    return n, edges
+
+
+def read_instances(f):
+    """
+    Generator, ki iz odprte datoteke (npr. sys.stdin) bere zaporedne primere v obeh formatih, zapisane kot v
+    vhodnih datotekah. Ce se vhod konca sredi primera, sprozi ValueError z zaporedno stevilko in glavo primera.
+    :param f: file - odprta tekstovna datoteka
+    :return: (n, 2D numpy array oblike (m, 2)) - za vsak primer velikost mnozice in primerjave
+    """
+    number = 0
+    for line in f:
+        header = line.split()
+        if not header:
+            continue
+        number += 1
+        # Primer v formatu realizatorja ima se dve vrstici, sicer po eno vrstico za vsako primerjavo
+        rows = 2 if header[0] == 'R' else int(header[1])
+        lines = [next(f, None) for _ in range(rows)]
+        if None in lines:
+            raise ValueError(f"Primer {number} ({' '.join(header)}) je nepopoln: pricakovanih {rows} vrstic, "
+                             f"prebranih {lines.index(None)}")
+        yield parse_instance(' '.join([line] + lines))
+
+
+def create_graph(path, reduction=False):
     """
     Funkcija, ki iz podane vhodne datoteke ustvari usmerjen graf, ki predstavlja delno urejenost, opisano v vhodni datoteki
     :param path: String - pot do vhodne datoteke
+    :param reduction: boolean - ali vrnemo le pokritja (tranzitivno redukcijo) namesto vseh primerjav iz datoteke
     :return: networkx.DiGraph - usmerjen graf, v katerem povezava u -> v pomeni, da je u < v
     """
-    f = open(path, 'r')
-    g = nx.DiGraph()
+    n, edges = read_edges(path)
+    return edges_to_graph(n, edges, reduction)
 
-    # Velikost mnozice
-    n = int(f.readline().split(" ")[0])
 
-    # Dodamo vsa vozlisca v graf
-    for i in range(n):
-        g.add_node(i+1)
+def read_poset(path):
+    """
+    Funkcija, ki iz podane vhodne datoteke ustvari nespremenljivo delno urejenost (brez networkx grafa)
+    :param path: String - pot do vhodne datoteke
+    :return: relations.Poset - elementi so oznaceni z 1, ..., n kot v create_graph
+    """
+    return Poset.from_edges(*read_edges(path))
 
-    # Gremo cez vse primerjave in dodamo povezave v graf
-    for line in f:
-        u, v = line.strip().split(" ")
-        u, v = int(u), int(v)
-        g.add_edge(u, v)
 
+def edges_to_graph(n, edges, reduction=False):
+    """
+    Funkcija, ki iz tabele primerjav ustvari usmerjen graf, kot ga vrne create_graph
+    :param n: int - velikost mnozice
+    :param edges: 2D numpy array oblike (m, 2) - primerjave u v (u < v, indeksirano z 1)
+    :param reduction: boolean - ali vrnemo le pokritja (tranzitivno redukcijo)
+    :return: networkx.DiGraph - usmerjen graf, v katerem povezava u -> v pomeni, da je u < v
+    """
+    g = nx.DiGraph()
+    # Dodamo vsa vozlisca v graf
+    g.add_nodes_from(range(1, n + 1))
+    # Dodamo vse primerjave
+    g.add_edges_from(edges.tolist())
+
+    if reduction:
+        return transitive_reduction(g)
     return g
@@ -0,0 +1,214 @@
+import math
+import networkx as nx
+
+from relations import Poset, get_closure_bitmasks, get_cover_bitmasks, get_bit_indices
+
+
+def _restrict(labels, down, up, mask):
+    """
+    Funkcija, ki delno urejenost zozi na elemente v maski in jih ponovno oznaci z zaporednimi indeksi
+    """
+    elements = get_bit_indices(mask)
+    position = {e: i for i, e in enumerate(elements)}
+
+    def compress(m):
+        result = 0
+        for e in get_bit_indices(m & mask):
+            result |= 1 << position[e]
+        return result
+
+    return [labels[e] for e in elements], [compress(down[e]) for e in elements], [compress(up[e]) for e in elements]
+
+
+def _components(down, up):
+    """
+    Funkcija, ki vrne maske povezanih komponent grafa primerljivosti
+    """
+    k = len(down)
+    remaining = (1 << k) - 1
+    components = []
+    while remaining:
+        component = remaining & -remaining
+        frontier = component
+        while frontier:
+            bit = frontier & -frontier
+            frontier ^= bit
+            i = bit.bit_length() - 1
+            new = (down[i] | up[i]) & ~component
+            component |= new
+            frontier |= new
+        components.append(component)
+        remaining &= ~component
+    return components
+
+
+def _series_layers(down, up):
+    """
+    Funkcija, ki vrne maske plasti ordinalne vsote (vsak element nizje plasti je manjsi od vsakega elementa visje plasti)
+    """
+    k = len(down)
+    # Urejanje po stevilu manjsih elementov je linearna razsiritev; vsak rez ordinalne vsote je njena predpona
+    order = sorted(range(k), key=lambda i: bin(down[i]).count("1"))
+    full = (1 << k) - 1
+    layers = []
+    prefix = 0
+    layer = 0
+    common = full
+    for i in order[:-1]:
+        prefix |= 1 << i
+        layer |= 1 << i
+        common &= up[i]
+        if common & (full & ~prefix) == full & ~prefix:
+            layers.append(layer)
+            layer = 0
+    layers.append(layer | (1 << order[-1]))
+    return layers
+
+
+def _make_chain(down, up, module):
+    """
+    Funkcija, ki modul nadomesti z verigo (relacije z elementi izven modula ostanejo enake)
+    """
+    elements = sorted(get_bit_indices(module), key=lambda i: bin(down[i] & module).count("1"))
+    below = 0
+    for i in elements:
+        down[i] = (down[i] & ~module) | below
+        below |= 1 << i
+    above = 0
+    for i in reversed(elements):
+        up[i] = (up[i] & ~module) | above
+        above |= 1 << i
+
+
+def _minimal_module(down, up, x, y, full):
+    """
+    Funkcija, ki vrne najmanjsi modul, ki vsebuje x in y. Element w razdvoji mnozico S, ce je z nekaterimi elementi S v
+    drugacni relaciji kot z drugimi; ob dodajanju z v S so novi razdvojevalci ravno elementi, ki so z z v drugacni
+    relaciji kot z x.
+    """
+    module = (1 << x) | (1 << y)
+    frontier = ((down[x] ^ down[y]) | (up[x] ^ up[y])) & ~module
+    while frontier:
+        bit = frontier & -frontier
+        module |= bit
+        if module == full:
+            return full
+        z = bit.bit_length() - 1
+        frontier = (frontier | (down[x] ^ down[z]) | (up[x] ^ up[z])) & ~module
+    return module
+
+
+def _decompose(labels, down, up):
+    """
+    Rekurzivna dekompozicija delne urejenosti, podane z maskami tranzitivne ovojnice
+    :return: (factor, pieces) - stevilo linearnih razsiritev je factor krat produkt stevil razsiritev kosov (labels, down, up)
+    """
+    k = len(labels)
+    if k <= 1:
+        return 1, []
+
+    # Nepovezane komponente: razsiritve komponent prepletemo na multinom nacinov
+    components = _components(down, up)
+    if len(components) > 1:
+        factor = math.factorial(k)
+        pieces = []
+        for component in components:
+            factor //= math.factorial(bin(component).count("1"))
+            f, p = _decompose(*_restrict(labels, down, up, component))
+            factor *= f
+            pieces += p
+        return factor, pieces
+
+    # Ordinalna vsota: produkt razsiritev posameznih plasti
+    layers = _series_layers(down, up)
+    if len(layers) > 1:
+        factor = 1
+        pieces = []
+        for layer in layers:
+            f, p = _decompose(*_restrict(labels, down, up, layer))
+            factor *= f
+            pieces += p
+        return factor, pieces
+
+    down = list(down)
+    up = list(up)
+    full = (1 << k) - 1
+
+    # Dvojcki (elementi z enakimi manjsimi in vecjimi elementi) so antiveriga, ki jo nadomestimo z verigo
+    twins = dict()
+    for i in range(k):
+        twins.setdefault((down[i], up[i]), []).append(i)
+    factor = 1
+    for group in twins.values():
+        if len(group) > 1:
+            factor *= math.factorial(len(group))
+            module = 0
+            for i in group:
+                module |= 1 << i
+            _make_chain(down, up, module)
+    if factor > 1:
+        f, pieces = _decompose(labels, down, up)
+        return factor * f, pieces
+
+    # Splosni moduli: e(P) = e(P z modulom M, zamenjanim z verigo) * e(M)
+    modules = set()
+    for x in range(k):
+        incomparable = full & ~(down[x] | up[x] | (1 << x)) & ~((1 << x) - 1)
+        for y in get_bit_indices(incomparable):
+            module = _minimal_module(down, up, x, y, full)
+            if module != full:
+                modules.add(module)
+    if modules:
+        chosen = 0
+        pieces = []
+        for module in sorted(modules, key=lambda m: bin(m).count("1")):
+            if module & chosen:
+                continue
+            chosen |= module
+            f, p = _decompose(*_restrict(labels, down, up, module))
+            factor *= f
+            pieces += p
+            _make_chain(down, up, module)
+        f, p = _decompose(labels, down, up)
+        return factor * f, pieces + p
+
+    return 1, [(labels, down, up)]
+
+
+def decompose(partial_order):
+    """
+    Funkcija, ki delno urejenost razbije na nerazcepne kose. Nepovezane komponente zdruzi z multinomskim koeficientom,
+    plasti ordinalne vsote s produktom, module (vkljucno z razredi dvojckov) pa presteje posebej in jih nadomesti z
+    verigo.
+    :param partial_order: networkx.DiGraph ali relations.Poset - vozlisca so mnozice tock, povezava u -> v pomeni, da
+                          je u < v
+    :return: (factor, pieces) - stevilo linearnih razsiritev je enako factor krat produkt stevil linearnih razsiritev
+             kosov; kosi so networkx.DiGraph, ki vsebujejo le pokritja, oziroma Poset, ce je vhod Poset
+    """
+    factor, pieces = _decompose(*get_closure_bitmasks(partial_order))
+    if isinstance(partial_order, Poset):
+        return factor, [Poset(labels, down, up) for labels, down, up in pieces]
+    graphs = []
+    for labels, down, up in pieces:
+        g = nx.DiGraph()
+        g.add_nodes_from(labels)
+        for i, mask in enumerate(get_cover_bitmasks(up)):
+            for j in get_bit_indices(mask):
+                g.add_edge(labels[i], labels[j])
+        graphs.append(g)
+    return factor, graphs
+
+
+def decomposed(counter):
+    """
+    Funkcija, ki algoritem za stetje ovije tako, da ga poklice le na nerazcepnih kosih delne urejenosti
+    :param counter: function - algoritem, ki za delno urejenost vrne stevilo linearnih razsiritev
+    :return: function - algoritem, ki sprejme delno urejenost in vrne stevilo linearnih razsiritev
+    """
+    def wrapped(partial_order):
+        linear_extensions, pieces = decompose(partial_order)
+        for piece in pieces:
+            linear_extensions *= counter(piece)
+        return linear_extensions
+
+    return wrapped
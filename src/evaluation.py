@@ -1,71 +1,343 @@
 import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
-import time
-from tqdm.auto import trange
 import os
+import glob
+import json
 
-from data_preparation import generate_data, generate_with_antichain, create_graph
+from data_preparation import generate_data, generate_with_antichain, read_poset
 from algorithms import divide_and_conquer, paper_algorithm
+from decomposition import decomposed
+from scheduler import run_jobs
+from corpus import Corpus, pack_corpus
+from cache import Fingerprint
+from benchmark import measure
+from instrumentation import Instrumentation, phase, run_counter
 
 
-def measure_execution(partial_order, algorithm, repeats=100):
+def measure_execution(partial_order, algorithm, repeats=100, warmup=1, disable_gc=True, precision=None,
+                      min_repeats=5, max_time=None):
     """
     Funkcija, ki izmeri cas izvajanja algoritma na delni urejenosti. Funkcija algoritem izvede veckrat in vrne seznam
-    posameznih casov izvajanja.
-    :param partial_order: networkx.DiGraph - delna urejenost predstavljena z grafom, kot jo vrne funkcija create_graph
+    posameznih casov izvajanja. Merjenje opravi benchmark.measure (perf_counter_ns, ogrevanje, izklop cistilca).
+    Ce je podan precision ali max_time, meritve ponavljamo le, dokler ni izpolnjen pogoj iz _converged (najvec
+    repeats meritev).
+    :param partial_order: relations.Poset ali networkx.DiGraph - delna urejenost, kot jo vrne funkcija read_poset ali
+                          create_graph
     :param algorithm: function - ali divide_and_conquer ali pa paper_algorithm
-    :param repeats: int - stevilo meritev
-    :return: (1D numpy array, result) - tabela, ki hrani cas izvajanja za vsako meritev in rezultat klica algoritma
+    :param repeats: int - stevilo meritev (pri prilagodljivem merjenju najvecje stevilo meritev)
+    :param warmup: int - stevilo izvajanj pred meritvami
+    :param disable_gc: bool - ali med meritvami izklopimo cistilca pomnilnika
+    :param precision: float - zelena polovica sirine intervala zaupanja kot delez povprecja, None pomeni brez pogoja
+    :param min_repeats: int - najmanjse stevilo meritev, preden preverimo sirino intervala zaupanja
+    :param max_time: float - najvec skupnega casa meritev v sekundah, None pomeni brez omejitve
+    :return: (1D numpy array, result) - tabela, ki hrani cas izvajanja za vsako meritev v sekundah in rezultat klica algoritma
     """
-    times = np.empty(repeats)
-    result = None
-    for i in trange(repeats):
-        # Zacnemo meriti cas
-        start_time = time.time()
-        # Izvedemo algoritem
-        result = algorithm(partial_order)
-        # Ustavimo merjenje
-        end_time = time.time()
-
-        # Pretecen cas je razlika med koncnim in zacetnim
-        times[i] = end_time - start_time
+    if precision is None and max_time is None:
+        times, result = measure(partial_order, algorithm, repeats, warmup, disable_gc)
+        return times / 1e9, result
 
-    return times, result
+    times = []
+    result = None
+    for i in range(repeats):
+        t, result = measure(partial_order, algorithm, 1, warmup if i == 0 else 0, disable_gc)
+        times.append(t[0] / 1e9)
+        if _converged(times, precision, min_repeats, max_time):
+            break
+    return np.array(times), result
 
 
-def bootstrap_ci(x, alpha=0.95, nsamples=1000):
+def bootstrap_ci(x, alpha=0.95, nsamples=1000, rng=None):
     """
-    Funkcija, ki izracuna alpha-interval zaupanja za povprecje vektorja x s pomocjo bootstrap vzorcenja.
+    Funkcija, ki izracuna alpha-interval zaupanja za povprecje vektorja x s pomocjo bootstrap vzorcenja. Vse vzorce
+    dobimo hkrati kot matriko indeksov oblike (nsamples, n).
     :param x: 1D numpy array - podatki, katerih povprecje nas zanima
     :param alpha: float - nivo zaupanja
     :param nsamples: int - stevilo bootstrap vzorcev
+    :param rng: numpy.random.Generator - generator nakljucnih stevil, None pomeni nov generator
     :return: (c_min, c_max) - spodnja in zgornja meja za interval zaupanja
     """
+    if rng is None:
+        rng = np.random.default_rng()
+    x = np.asarray(x)
     # Velikost vzorcev
     n = len(x)
 
-    samples = np.empty(nsamples)
-    for i in range(nsamples):
-        samples[i] = np.mean(np.random.choice(x, size=n))
+    samples = x[rng.integers(0, n, size=(nsamples, n))].mean(axis=1)
 
-    # Uredimo vzorce, in izracunamo indeks kvantila
+    # Uredimo vzorce, in izracunamo indeks kvantila (med povprecji vzorcev, ne med podatki)
     samples = np.sort(samples)
-    quantile = int(np.ceil((1-alpha)*n/2))
+    quantile = max(1, int(np.ceil((1-alpha)*nsamples/2)))
 
     return samples[quantile-1], samples[-quantile]
 
 
-def compare_algorithms(set_sizes, n_sets, n_antichains):
+def _converged(times, precision=None, min_repeats=5, max_time=None, alpha=0.95):
     """
-    Funkcija, ki izmeri povprecen cas izvajanja obeh algoritmov na mnozicah razlicnih velikosti in izracuna interval
-    zaupanja za posamezno povprecje. Funkcija na koncu izrise povprecni cas izvajanja v odvisnosti od velikosti mnozice
-    za oba algoritma.
+    Funkcija, ki pove, ali lahko z meritvami prenehamo: skupni cas je dosegel max_time ali pa je po vsaj min_repeats
+    meritvah polovica sirine bootstrap intervala zaupanja najvec precision-krat povprecje. Generator ima fiksno seme,
+    zato je odlocitev za iste case vedno enaka (tudi ob nadaljevanju evalvacije).
+    :param times: float list - dosedanji casi meritev v sekundah
+    :return: bool - ali so meritve dovolj natancne
+    """
+    if max_time is not None and sum(times) >= max_time:
+        return True
+    if precision is None or len(times) < max(min_repeats, 2):
+        return False
+    lower, upper = bootstrap_ci(times, alpha, rng=np.random.default_rng(0))
+    return (upper - lower) / 2 <= precision * np.mean(times)
+
+
+def _collect_times(results, n, algorithm):
+    """
+    Funkcija, ki vrne povprecne case izvajanja koncanih poslov za podano velikost mnozice in algoritem. Ponovitve
+    istega primera niso neodvisne, zato vsak posel najprej povzamemo s povprecjem, povprecje in interval zaupanja pa
+    nato racunamo cez primere.
+    """
+    return np.array([np.mean(r["times"]) for r in results if r["n"] == n and r["algorithm"] == algorithm])
+
+
+def _mean(x):
+    return np.mean(x) if len(x) > 0 else np.nan
+
+
+def _ci(x, nsamples=1000):
+    # Ce noben posel ni koncal, intervala zaupanja ni
+    return bootstrap_ci(x, nsamples=nsamples) if len(x) > 0 else (np.nan, np.nan)
+
+
+def read_results(paths):
+    """
+    Funkcija, ki prebere tok rezultatov, kot ga zapisuje run_evaluation. Nepopolne vrstice (npr. zadnjo vrstico ob
+    prekinitvi) preskoci, podvojene zapise (ob zdruzevanju tokov vec sej ali racunalnikov) pa uposteva le enkrat.
+    :param paths: String ali String list - pot do datoteke ali seznam poti, katerih tokove zdruzimo
+    :return: list of dictionaries - zapisi
+    """
+    if isinstance(paths, str):
+        paths = [paths]
+
+    records = []
+    seen = set()
+    for path in paths:
+        if not os.path.exists(path):
+            continue
+        with open(path) as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                key = (record["config"], record["instance"], record["algorithm"], record.get("repeat"),
+                       "phases" in record, record.get("status"))
+                if key not in seen:
+                    seen.add(key)
+                    records.append(record)
+    return records
+
+
+def _append(path, record):
+    """
+    Funkcija, ki zapis doda na konec toka rezultatov in ga zapise na disk
+    """
+    line = json.dumps(record) + "\n"
+    with open(path, "ab+") as f:
+        # Ce je bilo prejsnje pisanje prekinjeno, zadnja vrstica nima konca; zapis zacnemo v novi vrstici, sicer bi ga
+        # read_results skupaj z nepopolno vrstico zavrgel
+        f.seek(0, os.SEEK_END)
+        if f.tell() > 0:
+            f.seek(-1, os.SEEK_END)
+            if f.read(1) != b"\n":
+                line = "\n" + line
+        f.write(line.encode())
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def _config_name(counter, decomposition):
+    return f"{getattr(counter, '__name__', 'counter')}/{decomposition}"
+
+
+def _instances(set_sizes, n_sets, n_antichains):
+    """
+    Funkcija, ki vrne pare (n, ime datoteke) vseh primerov evalvacije
+    """
+    instances = []
+    for n in set_sizes:
+        instances += [(n, f'vhod_{n}_{k + 1}.txt') for k in range(n_sets)]
+        instances += [(n, f'vhod_antichain_{n}_{k + 1}.txt') for k in range(n_antichains)]
+    return instances
+
+
+def run_evaluation(set_sizes, n_sets, n_antichains, counter=divide_and_conquer, decomposition=False,
+                   processes=None, timeout=None, memory_limit=None, cache=None, instrument=False, corpus=None,
+                   results_path='../results/evaluation.jsonl', repeats=100, precision=None, min_repeats=5,
+                   max_time=None):
+    """
+    Funkcija, ki izmeri case izvajanja vseh treh algoritmov in vsako meritev (primer, algoritem, ponovitev) takoj doda
+    v tok rezultatov. Ob ponovnem zagonu z enako konfiguracijo (counter in decomposition) izvede le manjkajoce
+    meritve, zato lahko dolgo evalvacijo prekinemo, nadaljujemo ali razdelimo med vec racunalnikov in tokove nato
+    zdruzimo (read_results).
     :param set_sizes: int list - velikosti mnozic, na katerih preizkusamo delovanje algoritmov
     :param n_sets: int - stevilo razlicnih nakljucnih primerov za vsako velikost mnozice
     :param n_antichains: int - stevilo razlicnih primerov z vsiljenimi verigami za vsako velikost mnozice
-    :return: None
+    :param results_path: String - datoteka toka rezultatov (JSON zapis v vsaki vrstici)
+    :param repeats: int - stevilo meritev za vsak par (primer, algoritem), pri prilagodljivem merjenju najvecje
+    :param precision: float - ce je podan, meritve ponavljamo le, dokler polovica sirine intervala zaupanja ni
+                      najvec precision-krat povprecje (glej _converged)
+    :param min_repeats: int - najmanjse stevilo meritev pri prilagodljivem merjenju
+    :param max_time: float - najvec skupnega casa meritev za par (primer, algoritem) v sekundah
+    Ostali parametri so enaki kot pri compare_algorithms.
+    """
+    if not os.path.exists(os.path.dirname(results_path) or '.'):
+        os.makedirs(os.path.dirname(results_path))
+    config = _config_name(counter, decomposition)
+
+    # Osnovni algoritem, po potrebi z dekompozicijo
+    basic = decomposed(counter) if decomposition else counter
+
+    # wrapper za poganjanje osnovnega algoritma, ki sprejme tudi instrumentacijo
+    def divide(graph, instrumentation=None):
+        with phase(instrumentation, "counting"):
+            return run_counter(basic, graph, instrumentation)
+
+    # wrapper za poganjanje algoritma iz clanka brez trojckov in cetvorckov
+    def without_triplets(graph, instrumentation=None):
+        return paper_algorithm(graph, triplets=False, counter=counter, decomposition=decomposition,
+                               instrumentation=instrumentation)
+
+    # wrapper za poganjanje algoritma iz clanka s trojcki in cetvorcki
+    def with_triplets(graph, instrumentation=None):
+        return paper_algorithm(graph, counter=counter, decomposition=decomposition, instrumentation=instrumentation)
+
+    algorithms = {"divide": divide, "paper": without_triplets, "paper_triplets": with_triplets}
+
+    # Ze opravljene meritve (indeks ponovitve -> cas) in posli, ki so ze prej presegli omejitve
+    measured = dict()
+    finished = set()
+    for r in read_results(results_path):
+        if r["config"] != config:
+            continue
+        key = (r["instance"], r["algorithm"])
+        if "time" in r:
+            measured.setdefault(key, dict())[r["repeat"]] = r["time"]
+        elif "phases" in r:
+            finished.add(key + ("phases",))
+        elif r.get("status") in ("timeout", "oom"):
+            # Sesutja in napake niso dokoncne, zato jih ob ponovnem zagonu poskusimo znova
+            finished.add(key)
+
+    def execute(job):
+        # Delno urejenost preberemo enkrat kot nespremenljiv Poset, ki ga algoritmi ne kopirajo in ne spreminjajo
+        g = read_poset(job["path"]) if corpus is None else corpus.poset(job["path"])
+        algorithm = algorithms[job["algorithm"]]
+
+        def write(record):
+            _append(results_path, {"config": config, "instance": job["instance"], "n": job["n"],
+                                   "algorithm": job["algorithm"], **record})
+
+        # Manjkajoce ponovitve dolocimo po indeksih, saj je lahko ob prekinitvi izgubljena katerakoli ponovitev
+        missing = sorted(set(range(repeats)) - set(job["times"]))
+        previous = list(job["times"].values())
+        # Ce so meritve ze v predpomnilniku, jih le prepisemo v tok in oznacimo, saj niso izmerjene v tej seji
+        if cache is not None and not job["times"]:
+            fingerprint = Fingerprint(g)
+            name = f"{job['algorithm']}/{getattr(counter, '__name__', 'counter')}/{decomposition}"
+            entry = cache.lookup(fingerprint, name)
+            if entry is not None:
+                for i, t in enumerate(entry["times"][:repeats]):
+                    write({"repeat": i, "time": t, "count": str(entry["count"]), "large_case": entry["large_case"],
+                           "A_size": entry["A_size"], "cached": True})
+                missing = []
+
+        # Izmerimo manjkajoce ponovitve izbranega algoritma, vsako takoj zapisemo
+        if missing:
+            print(f"Evalvacija algoritma {job['algorithm']} na vhodu {job['path']} ...")
+            times = []
+            for i in missing:
+                if _converged(previous + times, precision, min_repeats, max_time):
+                    break
+                t, result = measure_execution(g, algorithm, repeats=1, warmup=1 if not times else 0)
+                if isinstance(result, tuple):
+                    count, large_case, A_size = result
+                else:
+                    count, large_case, A_size = result, None, None
+                write({"repeat": i, "time": float(t[0]), "count": str(count), "large_case": large_case,
+                       "A_size": A_size})
+                times.append(t[0])
+            if cache is not None and not job["times"] and times:
+                cache.store(fingerprint, name, count, large_case, A_size, times)
+
+        # Faze in stevce izmerimo v locenem, necasovnem izvajanju, da meritve ostanejo neobremenjene
+        if instrument and not job["phases"]:
+            instrumentation = Instrumentation()
+            algorithm(g, instrumentation)
+            write({"phases": instrumentation.report()})
+        return {"status": "ok"}
+
+    def failed(result):
+        # Neuspele posle zabelezimo; tistih, ki so presegli omejitve, ob ponovnem zagonu ne izvajamo znova
+        if result["status"] != "ok":
+            print(f"Algoritem {result['algorithm']} na vhodu {result['path']} ni koncal: {result['status']}")
+            details = {k: result[k] for k in ("exitcode", "message") if k in result}
+            _append(results_path, {"config": config, "instance": result["instance"], "n": result["n"],
+                                   "algorithm": result["algorithm"], "status": result["status"], **details})
+
+    # Posli: vsak algoritem na vsakem nakljucnem primeru in na vsakem primeru z vsiljenimi antiverigami
+    jobs = []
+    for n, instance in _instances(set_sizes, n_sets, n_antichains):
+        for name in algorithms:
+            key = (instance, name)
+            times = measured.get(key, dict())
+            complete = set(range(repeats)) <= set(times) or _converged(list(times.values()), precision, min_repeats,
+                                                                        max_time)
+            phases = not instrument or key + ("phases",) in finished
+            if key in finished or (complete and phases):
+                continue
+            jobs.append({"n": n, "path": f'../data/{instance}', "instance": instance, "algorithm": name,
+                         "times": times, "phases": phases})
+
+    print(f"Pricenjam evalvacijo algoritmov ({len(jobs)} poslov) ...")
+    run_jobs(jobs, execute, processes, timeout, memory_limit, callback=failed)
+
+
+def plot_results(results_path, set_sizes, n_sets, n_antichains, counter=divide_and_conquer, decomposition=False,
+                 instrument=False, include_cached=True):
+    """
+    Funkcija, ki iz toka rezultatov izracuna povprecne case izvajanja in intervale zaupanja ter izrise grafe in
+    zapise .csv datoteke v mapo results. Uposteva le zapise podane konfiguracije in primere iz set_sizes.
+    :param results_path: String ali String list - tok rezultatov (ali vec tokov, ki jih zdruzimo)
+    :param include_cached: boolean - ali za pare brez svezih meritev uporabimo case, prepisane iz predpomnilnika
+                           (izmerjeni so bili v drugi seji, morda na drugem racunalniku); svezi casi imajo vedno
+                           prednost, saj casov iz razlicnih sej ne mesamo
+    Ostali parametri so enaki kot pri compare_algorithms.
     """
+    config = _config_name(counter, decomposition)
+    instances = dict((instance, n) for n, instance in _instances(set_sizes, n_sets, n_antichains))
+
+    # Meritve zdruzimo po parih (primer, algoritem)
+    jobs = dict()
+    for r in read_results(results_path):
+        if r["config"] != config or r["instance"] not in instances:
+            continue
+        key = (r["instance"], r["algorithm"])
+        if key not in jobs:
+            jobs[key] = {"n": instances[r["instance"]], "algorithm": r["algorithm"], "path": f"../data/{r['instance']}",
+                         "times": [], "cached_times": []}
+        job = jobs[key]
+        if "time" in r:
+            job["cached_times" if r.get("cached", False) else "times"].append(r["time"])
+            job["large_case"] = r["large_case"]
+            job["A_size"] = r["A_size"]
+        elif "phases" in r:
+            job["phases"] = r["phases"]
+    # Pari, ki v tej seji niso bili izmerjeni, ker so bili ze v predpomnilniku
+    for job in jobs.values():
+        if not job["times"] and include_cached:
+            job["times"] = job["cached_times"]
+    done = [job for job in jobs.values() if job["times"]]
+    for job in done:
+        job["times"] = np.array(job["times"])
+
     # Povprecni casi izvajanja ter intervali zaupanja za oba algoritma
     time_divide = []
     time_paper = []
@@ -91,103 +363,47 @@ def compare_algorithms(set_sizes, n_sets, n_antichains):
     A_size_upper_triplets = []
     A_size_lower_triplets = []
 
-    print("Pricenjam evalvacijo algoritmov ...")
-
     for n in set_sizes:
         # Casi izvajanja pri tem n za vse tri algoritme
-        results_divide = np.array([])
-        results_paper = np.array([])
-        results_paper_triplets = np.array([])
-
-        # Ali smo sli v large matching case
-        large_matching = []
-        large_matching_triplets = []
-
-        # Velikost mnozice A
-        A_sizes = []
-        A_sizes_triplets = []
-
-        # wrapper za poganjanje algoritma iz clanka brez trojckov in cetvorckov
-        def without_triplets(graph):
-            return paper_algorithm(graph, triplets=False)
-
-        # Evalviramo na nakljucnih primerih
-        for k in range(n_sets):
-            # Pot do vhodne datoteke
-            path = f'../data/vhod_{n}_{k+1}.txt'
-            # Ustvarimo graf, ki predstavlja podano delno urejenost
-            g = create_graph(path)
-
-            # Izvedemo vse tri algoritme, razsirimo rezultate
-            print(f"Evalvacija osnovnega deli in vladaj algoritma za n = {n} in k = {k+1} ...")
-            results_divide = np.concatenate((results_divide, measure_execution(g, divide_and_conquer)[0]))
-            print(f"Evalvacija algoritma iz clanka za n = {n} in k = {k+1} ...")
-            times, results = measure_execution(g, without_triplets)
-            results_paper = np.concatenate((results_paper, times))
-            large_matching.append(results[1])
-            A_sizes.append(results[2])
-            print(f"Evalvacija algoritma iz clanka s trojcki in cetvorcki za n = {n} in k = {k+1} ...")
-            times, results = measure_execution(g, paper_algorithm)
-            results_paper_triplets = np.concatenate((results_paper_triplets, times))
-            large_matching_triplets.append(results[1])
-            A_sizes_triplets.append(results[2])
-
-        # Evalviramo na primerih z vsiljenimi antiverigami
-        for k in range(n_antichains):
-            # Pot do vhodne datoteke
-            path = f'../data/vhod_antichain_{n}_{k + 1}.txt'
-            # Ustvarimo graf, ki predstavlja podano delno urejenost
-            g = create_graph(path)
-
-            # Izvedemo vse tri algoritme, razsirimo rezultate
-            print(f"Evalvacija osnovnega deli in vladaj algoritma na vsiljenih antiverigah za n = {n} in k = {k + 1} ...")
-            results_divide = np.concatenate((results_divide, measure_execution(g, divide_and_conquer)[0]))
-            print(f"Evalvacija algoritma iz clanka na vsiljenih antiverigah za n = {n} in k = {k + 1} ...")
-            times, results = measure_execution(g, without_triplets)
-            results_paper = np.concatenate((results_paper, times))
-            large_matching.append(results[1])
-            A_sizes.append(results[2])
-            print(f"Evalvacija algoritma iz clanka s trojcki in cetvorcki na vsiljenih antiverigah za n = {n} in k = {k + 1} ...")
-            times, results = measure_execution(g, paper_algorithm)
-            results_paper_triplets = np.concatenate((results_paper_triplets, times))
-            large_matching_triplets.append(results[1])
-            A_sizes_triplets.append(results[2])
-
-        # Spremenimo v arraye za lazje racunanje
-        large_matching = np.array(large_matching)
-        large_matching_triplets = np.array(large_matching_triplets)
-        A_sizes = np.array(A_sizes)
-        A_sizes_triplets = np.array(A_sizes_triplets)
+        results_divide = _collect_times(done, n, "divide")
+        results_paper = _collect_times(done, n, "paper")
+        results_paper_triplets = _collect_times(done, n, "paper_triplets")
+
+        # Ali smo sli v large matching case in velikost mnozice A
+        large_matching = np.array([r["large_case"] for r in done if r["n"] == n and r["algorithm"] == "paper"])
+        large_matching_triplets = np.array([r["large_case"] for r in done if r["n"] == n and r["algorithm"] == "paper_triplets"])
+        A_sizes = np.array([r["A_size"] for r in done if r["n"] == n and r["algorithm"] == "paper"])
+        A_sizes_triplets = np.array([r["A_size"] for r in done if r["n"] == n and r["algorithm"] == "paper_triplets"])
 
         # Izracunamo povprecje in interval zaupanja za vse tri algoritme pri tem n in dodamo k rezultatom
-        time_divide.append(np.mean(results_divide))
-        lower, upper = bootstrap_ci(results_divide)
+        time_divide.append(_mean(results_divide))
+        lower, upper = _ci(results_divide)
         lower_divide.append(lower)
         upper_divide.append(upper)
-        time_paper.append(np.mean(results_paper))
-        lower, upper = bootstrap_ci(results_paper)
+        time_paper.append(_mean(results_paper))
+        lower, upper = _ci(results_paper)
         lower_paper.append(lower)
         upper_paper.append(upper)
-        time_paper_triplets.append(np.mean(results_paper_triplets))
-        lower, upper = bootstrap_ci(results_paper_triplets)
+        time_paper_triplets.append(_mean(results_paper_triplets))
+        lower, upper = _ci(results_paper_triplets)
         lower_paper_triplets.append(lower)
         upper_paper_triplets.append(upper)
 
         # Izracunamo intervale zaupanja za odstotek primerov, ko gremo v large matching case
-        lower, upper = bootstrap_ci(large_matching, nsamples=100)
+        lower, upper = _ci(large_matching, nsamples=100)
         large_matching_lower.append(100*np.round(lower, 4))
         large_matching_upper.append(100*np.round(upper, 4))
-        lower, upper = bootstrap_ci(large_matching_triplets, nsamples=100)
+        lower, upper = _ci(large_matching_triplets, nsamples=100)
         large_matching_lower_triplets.append(100 * np.round(lower, 4))
         large_matching_upper_triplets.append(100 * np.round(upper, 4))
 
         # Povprecna velikost A in interval zaupanja
-        A_size.append(np.mean(A_sizes))
-        lower, upper = bootstrap_ci(A_sizes, nsamples=100)
+        A_size.append(_mean(A_sizes))
+        lower, upper = _ci(A_sizes, nsamples=100)
         A_size_lower.append(lower)
         A_size_upper.append(upper)
-        A_size_triplets.append(np.mean(A_sizes_triplets))
-        lower, upper = bootstrap_ci(A_sizes_triplets, nsamples=100)
+        A_size_triplets.append(_mean(A_sizes_triplets))
+        lower, upper = _ci(A_sizes_triplets, nsamples=100)
         A_size_lower_triplets.append(lower)
         A_size_upper_triplets.append(upper)
 
@@ -224,6 +440,22 @@ def compare_algorithms(set_sizes, n_sets, n_antichains):
     else:
         df.to_csv('../results/large_matching_antichains.csv', index=False)
 
+    # Casi faz in stevci stetja za vsak izmerjen posel
+    if instrument:
+        rows = []
+        for r in done:
+            if "phases" in r:
+                row = {"n": r["n"], "path": r["path"], "algorithm": r["algorithm"],
+                       "branches_per_state": r["phases"]["branches_per_state"]}
+                row.update({f"time_{name}": value for name, value in r["phases"]["timers"].items()})
+                row.update(r["phases"]["counters"])
+                rows.append(row)
+        df = pd.DataFrame(rows)
+        if n_antichains == 0:
+            df.to_csv('../results/phases.csv', index=False)
+        else:
+            df.to_csv('../results/phases_antichains.csv', index=False)
+
     # Graficna primerjava velikosti mnozice A
     plt.figure(figsize=(16, 9))
     plt.plot(set_sizes, A_size, color="blue", marker="o", label="Povprečna velikost brez trojčkov")
@@ -247,6 +479,44 @@ def compare_algorithms(set_sizes, n_sets, n_antichains):
         plt.savefig('../results/A_size_comparison_antichains.png')
 
 
+
+
+def compare_algorithms(set_sizes, n_sets, n_antichains, counter=divide_and_conquer, decomposition=False,
+                       processes=None, timeout=None, memory_limit=None, cache=None, instrument=False,
+                       corpus=None, results_path='../results/evaluation.jsonl', repeats=100, precision=None,
+                       min_repeats=5, max_time=None, include_cached=True):
+    """
+    Funkcija, ki izmeri povprecen cas izvajanja obeh algoritmov na mnozicah razlicnih velikosti in izracuna interval
+    zaupanja za posamezno povprecje. Funkcija na koncu izrise povprecni cas izvajanja v odvisnosti od velikosti mnozice
+    za oba algoritma.
+    :param set_sizes: int list - velikosti mnozic, na katerih preizkusamo delovanje algoritmov
+    :param n_sets: int - stevilo razlicnih nakljucnih primerov za vsako velikost mnozice
+    :param n_antichains: int - stevilo razlicnih primerov z vsiljenimi verigami za vsako velikost mnozice
+    :param counter: function - algoritem za stetje linearnih razsiritev, ki ga uporabimo kot osnovni algoritem in v
+                    koncnem koraku algoritma iz clanka (divide_and_conquer, bitmask_divide_and_conquer,
+                    meet_in_the_middle, vectorized.vectorized_count ali chains.chain_count)
+    :param decomposition: boolean - ali vsi trije algoritmi delno urejenost najprej razbijejo na nerazcepne kose
+    :param processes: int - stevilo hkratnih poslov (vsak na svojem jedru), None pomeni zaporedno izvajanje
+    :param timeout: float - najdaljsi cas v sekundah za posel (en algoritem na enem primeru), le pri processes
+    :param memory_limit: int - najvec pomnilnika v bajtih za posel, le pri processes
+    :param cache: cache.CountCache - ce je podan, se rezultati in casi meritev shranijo vanj, posli z ze shranjenimi
+                  meritvami za izomorfno delno urejenost pa se ne izvedejo ponovno
+    :param instrument: bool - ali za vsak izmerjen posel zabelezimo se case faz in stevce stetja (phases.csv)
+    :param corpus: corpus.Corpus - ce je podan, primere beremo iz zapakiranega korpusa namesto iz posameznih datotek
+    :param results_path: String - tok rezultatov, v katerega sproti zapisujemo meritve (glej run_evaluation)
+    :param repeats: int - stevilo meritev za vsak par (primer, algoritem), pri prilagodljivem merjenju najvecje
+    :param precision: float - ce je podan, meritve ponavljamo le, dokler polovica sirine intervala zaupanja ni
+                      najvec precision-krat povprecje
+    :param min_repeats: int - najmanjse stevilo meritev pri prilagodljivem merjenju
+    :param max_time: float - najvec skupnega casa meritev za par (primer, algoritem) v sekundah
+    :param include_cached: boolean - ali pri izrisu za pare brez svezih meritev uporabimo case iz predpomnilnika
+    :return: None
+    """
+    run_evaluation(set_sizes, n_sets, n_antichains, counter, decomposition, processes, timeout, memory_limit, cache,
+                   instrument, corpus, results_path, repeats, precision, min_repeats, max_time)
+    plot_results(results_path, set_sizes, n_sets, n_antichains, counter, decomposition, instrument, include_cached)
+
+
 if __name__ == "__main__":
     # Velikosti mnozic, ki jih bomo testirali
     VELIKOSTI_MNOZIC = [5, 10, 15, 20, 25, 30, 35, 40, 45]
@@ -258,15 +528,26 @@ if __name__ == "__main__":
     STEVILO_ANTIVERIG = 10
     # Velikosti vsiljenih antiverig
     VELIKOSTI_ANTIVERIG = 5*[1/3] + 5*[1/2]
+    # Meritve ponavljamo, dokler polovica sirine intervala zaupanja ni najvec 2 % povprecja (najvec 100 meritev in
+    # 60 sekund za vsak par primer, algoritem)
+    NATANCNOST = 0.02
+    NAJDALJSI_CAS = 60
 
     # Ustvarimo mnozice
     generate_data(VELIKOSTI_MNOZIC, STEVILO_PRIMEROV, seed=42)
 
+    # Primere zapakiramo v eno datoteko, ki jo med evalvacijo le preslikamo v pomnilnik
+    pack_corpus(sorted(glob.glob('../data/vhod_*.txt')), '../data/corpus.bin')
+
     # Izvedemo eksperiment brez vsiljenih antiverig
-    compare_algorithms(VELIKOSTI_MNOZIC, STEVILO_PRIMEROV, 0)
+    compare_algorithms(VELIKOSTI_MNOZIC, STEVILO_PRIMEROV, 0, corpus=Corpus('../data/corpus.bin'),
+                       precision=NATANCNOST, max_time=NAJDALJSI_CAS)
 
     # Ustvarimo mnozice z antiverigami
     generate_with_antichain(VELIKOSTI_MNOZIC_ANTIVERIGE, STEVILO_ANTIVERIG, VELIKOSTI_ANTIVERIG, seed=7)
 
+    pack_corpus(sorted(glob.glob('../data/vhod_*.txt')), '../data/corpus.bin')
+
     # Izvedemo eksperiment z vsiljenimi antiverigami
-    compare_algorithms(VELIKOSTI_MNOZIC_ANTIVERIGE, STEVILO_PRIMEROV, STEVILO_ANTIVERIG)
+    compare_algorithms(VELIKOSTI_MNOZIC_ANTIVERIGE, STEVILO_PRIMEROV, STEVILO_ANTIVERIG,
+                       corpus=Corpus('../data/corpus.bin'), precision=NATANCNOST, max_time=NAJDALJSI_CAS)
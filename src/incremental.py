@@ -0,0 +1,109 @@
+import networkx as nx
+
+from algorithms import bitmask_divide_and_conquer
+from relations import Poset, get_bitmasks, get_closure_bitmasks
+
+
+class IncrementalCounter:
+    """
+    Stevec linearnih razsiritev, ki po dodajanju ali odstranjevanju primerjav ne racuna vsega znova. Tabela hrani za
+    vsak ideal I stevilo linearnih razsiritev delne urejenosti, zozene na I. To stevilo je odvisno le od primerjav med
+    elementi I, zato ob spremembi zavrzemo le vnose, ki vsebujejo oba elementa nekega para, katerega primerljivost se
+    je spremenila. Manjkajoce vnose nato izracunamo od celotne mnozice navzdol, dokler ne naletimo na veljavne.
+    """
+
+    def __init__(self, partial_order):
+        """
+        :param partial_order: networkx.DiGraph ali relations.Poset - vozlisca so mnozice tock, povezava u -> v pomeni,
+                              da je u < v
+        """
+        # Povezave spreminjamo, zato Poset pretvorimo v graf
+        self.graph = partial_order.to_graph() if isinstance(partial_order, Poset) else partial_order.copy()
+        self.labels = list(self.graph.nodes())
+        self.index = {node: i for i, node in enumerate(self.labels)}
+        self.full = (1 << len(self.labels)) - 1
+
+        _, _, self.successors = get_bitmasks(self.graph)
+        _, _, self.up = get_closure_bitmasks(self.graph)
+        self.table = {0: 1}
+        self.count = bitmask_divide_and_conquer(self.graph, self.table)
+        self.table[self.full] = self.count
+
+    def add_relation(self, u, v):
+        """
+        Funkcija, ki doda primerjavo u < v in vrne novo stevilo linearnih razsiritev
+        """
+        return self.update(added=[(u, v)])
+
+    def remove_relation(self, u, v):
+        """
+        Funkcija, ki odstrani povezavo u -> v iz grafa in vrne novo stevilo linearnih razsiritev. Ce primerjava sledi
+        iz drugih povezav (tranzitivnost), ostane v delni urejenosti.
+        """
+        return self.update(removed=[(u, v)])
+
+    def update(self, added=(), removed=()):
+        """
+        Funkcija, ki hkrati doda in odstrani vec povezav ter vrne novo stevilo linearnih razsiritev
+        :param added: list of pairs - povezave u -> v (u < v), ki jih dodamo
+        :param removed: list of pairs - povezave, ki jih odstranimo
+        :return: Stevilo linearnih razsiritev spremenjene delne urejenosti
+        """
+        for u, v in removed:
+            if not self.graph.has_edge(u, v):
+                raise ValueError(f"Povezave {u} -> {v} ni v grafu")
+        for u, v in added:
+            if u not in self.index or v not in self.index:
+                raise ValueError(f"Povezava {u} -> {v} ne povezuje obstojecih vozlisc")
+        graph = self.graph.copy()
+        graph.remove_edges_from(removed)
+        graph.add_edges_from(added)
+        try:
+            _, _, up = get_closure_bitmasks(graph)
+        except nx.NetworkXUnfeasible:
+            raise ValueError("Dodane povezave bi ustvarile cikel")
+
+        # partners[b] so elementi a, za katere se je primerljivost a < b spremenila
+        partners = [0] * len(self.labels)
+        for a, (old, new) in enumerate(zip(self.up, up)):
+            changed = old ^ new
+            while changed:
+                bit = changed & -changed
+                changed ^= bit
+                partners[bit.bit_length() - 1] |= 1 << a
+        changed = [(1 << b, mask) for b, mask in enumerate(partners) if mask]
+        # Vnos je lahko neveljaven le, ce vsebuje vecji element nekega spremenjenega para
+        upper = sum(bit for bit, _ in changed)
+
+        self.graph = graph
+        self.up = up
+        _, _, self.successors = get_bitmasks(graph)
+        if changed:
+            self.table = {ideal: count for ideal, count in self.table.items()
+                          if ideal & upper == 0 or not any(ideal & bit and ideal & mask for bit, mask in changed)}
+            self.count = self._pull(self.full)
+        return self.count
+
+    def _pull(self, ideal):
+        """
+        Funkcija, ki vrne stevilo linearnih razsiritev ideala in pri tem izracuna vse manjkajoce vnose pod njim. Stevilo
+        za ideal I je vsota stevil za I - x po maksimalnih elementih x ideala I. Globina rekurzije je najvec n.
+        """
+        table = self.table
+        successors = self.successors
+
+        def pull(current):
+            total = 0
+            mask = current
+            while mask:
+                bit = mask & -mask
+                mask ^= bit
+                # Element je maksimalen, ce v idealu ni nobenega njegovega naslednika
+                if successors[bit.bit_length() - 1] & current == 0:
+                    count = table.get(current ^ bit)
+                    total += pull(current ^ bit) if count is None else count
+            table[current] = total
+            return total
+
+        count = table.get(ideal)
+        return pull(ideal) if count is None else count
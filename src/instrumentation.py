@@ -0,0 +1,85 @@
+import time
+import cProfile
+import inspect
+from contextlib import contextmanager, nullcontext
+
+
+class Instrumentation:
+    """
+    Zbiralnik meritev posameznih faz algoritma. Faze merimo s phase, stevce stanj in memoizacije pa algoritmi za stetje
+    polnijo neposredno v slovarju counters. Ce algoritmu instrumentacije ne podamo, ne dela nicesar dodatnega.
+    """
+
+    def __init__(self, profile_phase=None, profiler=cProfile.Profile):
+        """
+        :param profile_phase: String - ime faze, med katero tece profiler, None pomeni brez profiliranja
+        :param profiler: class - razred profilerja z metodama enable in disable (ali start in stop)
+        """
+        self.timers = dict()
+        self.counters = {"states": 0, "memo_hits": 0, "memo_misses": 0, "peak_memo": 0, "branches": 0,
+                         "max_branches": 0}
+        self.profile_phase = profile_phase
+        self.profiler = profiler
+        self.profiles = dict()
+
+    @contextmanager
+    def phase(self, name):
+        """
+        Kontekst, ki cas izvajanja pristeje casu faze in po potrebi med fazo pozene profiler
+        :param name: String - ime faze
+        """
+        profiler = None
+        if name == self.profile_phase:
+            profiler = self.profiles.get(name)
+            if profiler is None:
+                profiler = self.profiles[name] = self.profiler()
+            _start(profiler)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timers[name] = self.timers.get(name, 0.0) + time.perf_counter() - start
+            if profiler is not None:
+                _stop(profiler)
+
+    def report(self):
+        """
+        Funkcija, ki vrne zbrane meritve
+        :return: dictionary - casi faz v sekundah, stevci in povprecno stevilo vej na stanje
+        """
+        states = self.counters["states"]
+        return {"timers": dict(self.timers), "counters": dict(self.counters),
+                "branches_per_state": self.counters["branches"] / states if states else 0.0}
+
+
+def _start(profiler):
+    # cProfile.Profile uporablja enable, vzorcni profilerji (npr. pyinstrument) pa start
+    if hasattr(profiler, "enable"):
+        profiler.enable()
+    else:
+        profiler.start()
+
+
+def _stop(profiler):
+    if hasattr(profiler, "disable"):
+        profiler.disable()
+    else:
+        profiler.stop()
+
+
+def phase(instrumentation, name):
+    """
+    Funkcija, ki vrne kontekst za merjenje faze ali prazen kontekst, ce instrumentacija ni vklopljena
+    """
+    if instrumentation is None:
+        return nullcontext()
+    return instrumentation.phase(name)
+
+
+def run_counter(counter, partial_order, instrumentation):
+    """
+    Funkcija, ki poklice algoritem za stetje in mu, ce ga podpira, poda slovar stevcev instrumentacije
+    """
+    if instrumentation is not None and "stats" in inspect.signature(counter).parameters:
+        return counter(partial_order, stats=instrumentation.counters)
+    return counter(partial_order)
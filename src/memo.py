@@ -0,0 +1,177 @@
+import os
+import sqlite3
+import tempfile
+from collections import OrderedDict
+
+
+class MemoStore:
+    """
+    Omejena shramba za memoizacijo stevila linearnih razsiritev. Kljuci so shranjeni kot bitne maske (int), tudi ce jih
+    klicatelj podaja kot terke vozlisc. Shramba lahko v pomnilniku hrani najvec max_entries vnosov; ko je polna, po
+    principu LRU izrine najdlje neuporabljen vnos in ga zapise v svojo zacasno sqlite datoteko, od koder ga ob
+    naslednjem zahtevku prebere nazaj. Izrinjenih vnosov ne zavrzemo, saj bi jih divide_and_conquer sicer racunal
+    znova, stevilo ponovnih izracunov pa z n raste eksponentno. Kljuci izrinjenih vnosov ostanejo v pomnilniku, da
+    zgresitve ne berejo z diska. Kljuci so maske ene same delne urejenosti, zato si shrambe datotek ne delijo;
+    datoteka se ob close izbrise.
+    Shramba je koristna le za divide_and_conquer, ki vnose bere; bitmask_divide_and_conquer vanjo le pise.
+    """
+
+    def __init__(self, max_entries=None, spill_dir=None, spill_batch=10000):
+        """
+        :param max_entries: int - najvecje stevilo vnosov v pomnilniku, None pomeni neomejeno (in brez datoteke)
+        :param spill_dir: String - mapa za zacasno sqlite datoteko z izrinjenimi vnosi, None pomeni sistemsko mapo za
+                          zacasne datoteke
+        :param spill_batch: int - stevilo izrinjenih vnosov, ki jih naenkrat zapisemo na disk
+        """
+        self.max_entries = max_entries
+        self.spill_batch = spill_batch
+        self.entries = OrderedDict()
+        # Indeksi vozlisc, ce so kljuci podani kot terke
+        self.index = {}
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.disk_hits = 0
+
+        self.connection = None
+        self.spill_path = None
+        self.pending = {}
+        # Kljuci vseh izrinjenih vnosov (na disku ali v self.pending)
+        self.spilled = set()
+        if max_entries is not None:
+            descriptor, self.spill_path = tempfile.mkstemp(suffix=".sqlite", dir=spill_dir)
+            os.close(descriptor)
+            self.connection = sqlite3.connect(self.spill_path)
+            self.connection.execute("CREATE TABLE memo (ideal BLOB PRIMARY KEY, count BLOB)")
+
+    def pack(self, key):
+        """
+        Funkcija, ki kljuc pretvori v bitno masko
+        :param key: int ali terka vozlisc
+        :return: int - bitna maska
+        """
+        if isinstance(key, int):
+            return key
+        mask = 0
+        for node in key:
+            bit = self.index.get(node)
+            if bit is None:
+                bit = 1 << len(self.index)
+                self.index[node] = bit
+            mask |= bit
+        return mask
+
+    def get(self, key, default=None):
+        key = self.pack(key)
+        value = self.entries.get(key)
+        if value is not None:
+            self.hits += 1
+            if self.max_entries is not None:
+                self.entries.move_to_end(key)
+            return value
+
+        if self.connection is not None:
+            value = self._read_disk(key)
+            if value is not None:
+                self.hits += 1
+                self.disk_hits += 1
+                self._insert(key, value)
+                return value
+
+        self.misses += 1
+        return default
+
+    def __getitem__(self, key):
+        value = self.get(key)
+        if value is None:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key, value):
+        self._insert(self.pack(key), value)
+
+    def __contains__(self, key):
+        key = self.pack(key)
+        return key in self.entries or (self.connection is not None and self._read_disk(key) is not None)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def update(self, other):
+        for key, value in other.items():
+            self._insert(self.pack(key), value)
+
+    def stats(self):
+        """
+        Funkcija, ki vrne statistiko uporabe shrambe
+        :return: dictionary - zadetki, zgresitve, izrinjeni vnosi, zadetki na disku, trenutno stevilo vnosov v
+                 pomnilniku in stevilo razlicnih vnosov na disku
+        """
+        return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions, "disk_hits": self.disk_hits,
+                "entries": len(self.entries), "spilled": len(self.spilled)}
+
+    def close(self):
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
+            os.remove(self.spill_path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def _insert(self, key, value):
+        self.entries[key] = value
+        if self.max_entries is None or len(self.entries) <= self.max_entries:
+            return
+        # Izrinemo najdlje neuporabljen vnos
+        old_key, old_value = self.entries.popitem(last=False)
+        self.evictions += 1
+        self.spilled.add(old_key)
+        self.pending[old_key] = old_value
+        if len(self.pending) >= self.spill_batch:
+            self._flush()
+
+    def _flush(self):
+        rows = [(_to_bytes(key), _to_bytes(value)) for key, value in self.pending.items()]
+        self.connection.executemany("INSERT OR REPLACE INTO memo VALUES (?, ?)", rows)
+        self.connection.commit()
+        self.pending = {}
+
+    def _read_disk(self, key):
+        if key not in self.spilled:
+            return None
+        value = self.pending.get(key)
+        if value is not None:
+            return value
+        row = self.connection.execute("SELECT count FROM memo WHERE ideal = ?", (_to_bytes(key),)).fetchone()
+        if row is None:
+            return None
+        return int.from_bytes(row[0], "little")
+
+
+def _to_bytes(x):
+    return x.to_bytes((x.bit_length() + 7) // 8, "little")
+
+
+def with_memo_store(counter, max_entries=None, spill_dir=None):
+    """
+    Funkcija, ki algoritem za stetje ovije tako, da ob vsakem klicu uporabi novo MemoStore shrambo. Statistika zadnjega
+    klica je na voljo v atributu stats vrnjene funkcije.
+    :param counter: function - divide_and_conquer (bitmask_divide_and_conquer vnosov ne bere, zato mu shramba ne
+                    koristi)
+    :param max_entries: int - najvecje stevilo vnosov v pomnilniku
+    :param spill_dir: String - mapa za zacasne sqlite datoteke z izrinjenimi vnosi (vsak klic dobi svojo)
+    :return: function - algoritem, ki sprejme le delno urejenost
+    """
+    def wrapped(partial_order):
+        with MemoStore(max_entries, spill_dir) as memo:
+            result = counter(partial_order, memo)
+            wrapped.stats = memo.stats()
+        return result
+
+    wrapped.stats = None
+    return wrapped
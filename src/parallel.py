@@ -0,0 +1,107 @@
+import os
+import queue
+import multiprocessing as mp
+
+from relations import get_bitmasks
+
+
+def _shard(ideal, shards):
+    """
+    Funkcija, ki idealu doloci delez (razprsitev premesa tudi visje bite, da so delezi enakomerni)
+    """
+    return ((ideal ^ (ideal >> 31)) * 0x9E3779B97F4A7C15 >> 17) % shards
+
+
+def _expand(level, predecessors, full, shards):
+    """
+    Funkcija, ki ideale enega deleza razsiri na naslednji nivo mreze idealov
+    :param level: dictionary - stevila linearnih razsiritev idealov deleza na trenutnem nivoju
+    :return: list of dictionaries - delne vsote za ideale naslednjega nivoja, razdeljene po delezih
+    """
+    result = [dict() for _ in range(shards)]
+    for ideal, count in level.items():
+        free = full & ~ideal
+        while free:
+            bit = free & -free
+            free ^= bit
+            if predecessors[bit.bit_length() - 1] & ~ideal == 0:
+                extended = ideal | bit
+                # Razprsitev kot v _shard, zapisana na mestu, saj je to najbolj vroca zanka
+                target = result[((extended ^ (extended >> 31)) * 0x9E3779B97F4A7C15 >> 17) % shards]
+                target[extended] = target.get(extended, 0) + count
+    return result
+
+
+def _worker(rank, predecessors, full, n, inboxes, results):
+    """
+    Funkcija, ki se izvede v locenem procesu in obdeluje ideale deleza rank. Na vsakem nivoju svoje ideale razsiri,
+    delne vsote za tuje deleze poslje neposredno njihovim procesom in sesteje delne vsote, ki jih prejme zase.
+    Sporocila so oznacena z nivojem, saj lahko hitrejsi proces poslje vsote naslednjega nivoja, preden pocasnejsi
+    prejme vse vsote trenutnega.
+    """
+    shards = len(inboxes)
+    level = {0: 1} if _shard(0, shards) == rank else {}
+    early = dict()
+    for step in range(n):
+        outgoing = _expand(level, predecessors, full, shards)
+        for j, partial in enumerate(outgoing):
+            if j != rank:
+                inboxes[j].put((step, partial))
+
+        level = outgoing[rank]
+        received = early.pop(step, [])
+        while len(received) < shards - 1:
+            message_step, partial = inboxes[rank].get()
+            if message_step == step:
+                received.append(partial)
+            else:
+                early.setdefault(message_step, []).append(partial)
+        for partial in received:
+            for ideal, count in partial.items():
+                level[ideal] = level.get(ideal, 0) + count
+
+    results.put(level.get(full, 0))
+
+
+def parallel_count(partial_order, processes=None):
+    """
+    Vzporedno stetje linearnih razsiritev. Mrezo idealov obdelamo nivo po nivoju (nivo je velikost ideala), ideale
+    vsakega nivoja razdelimo med procese glede na razprsitev. Vsak proces hrani le ideale svojega deleza, delne vsote
+    za isti ideal pa si procesi posiljajo neposredno, zato glavni proces ni ozko grlo ne po casu ne po pomnilniku.
+    Ker so vsa stevila cela, je rezultat enak zaporednemu stetju.
+    :param partial_order: networkx.DiGraph ali relations.Poset - vozlisca so mnozice tock, povezava u -> v pomeni, da
+                          je u < v
+    :param processes: int - stevilo procesov, None pomeni stevilo jeder
+    :return: Stevilo linearnih razsiritev
+    """
+    n = partial_order.order()
+    if n <= 1:
+        return 1
+    if processes is None:
+        processes = os.cpu_count()
+
+    _, predecessors, _ = get_bitmasks(partial_order)
+    full = (1 << n) - 1
+
+    inboxes = [mp.Queue() for _ in range(processes)]
+    results = mp.Queue()
+    workers = [mp.Process(target=_worker, args=(rank, predecessors, full, n, inboxes, results))
+               for rank in range(processes)]
+    for worker in workers:
+        worker.start()
+
+    counts = []
+    try:
+        while len(counts) < processes:
+            try:
+                counts.append(results.get(timeout=1))
+            except queue.Empty:
+                # Ce se je kateri od procesov sesul, bi ostali na njegove vsote cakali v nedogled
+                if any(worker.exitcode not in (None, 0) for worker in workers):
+                    raise RuntimeError("Proces vzporednega stetja se je nepricakovano koncal")
+    finally:
+        for worker in workers:
+            if len(counts) < processes:
+                worker.terminate()
+            worker.join()
+    return sum(counts)
@@ -0,0 +1,270 @@
+import os
+import json
+import math
+import time
+import random
+import argparse
+import numpy as np
+
+from algorithms import divide_and_conquer, bitmask_divide_and_conquer, meet_in_the_middle, paper_reduction, \
+    get_maximal_matching
+from relations import ReachabilityIndex, get_closure_bitmasks, get_bit_indices
+from decomposition import decompose
+from vectorized import vectorized_count
+from chains import get_chain_decomposition, chain_count
+from data_preparation import read_poset
+
+
+# Znacilke, od katerih je odvisen cas posamezne strategije (imena strategij so enaka kot v benchmark.ALGORITHMS)
+FEATURES = {
+    "divide": ["ideals", "size"],
+    "bitmask": ["ideals", "size"],
+    "meet": ["ideals", "size"],
+    "vectorized": ["ideals", "size"],
+    "chains": ["chain_states", "width"],
+    "paper": ["ideals_paper", "size", "matching", "A_paper"],
+    "paper_triplets": ["ideals_paper_triplets", "size", "matching", "A_paper_triplets"],
+}
+
+# Strategije, za katere potrebujemo korake algoritma iz clanka (drazje znacilke)
+PAPER_STRATEGIES = ["paper", "paper_triplets"]
+
+
+def _count_reduced(reduction):
+    reduced, factor, _, _ = reduction
+    return factor * divide_and_conquer(reduced)
+
+
+# Izvedba strategije na delni urejenosti; ze izracunane redukcije iz clanka uporabimo znova
+STRATEGIES = {
+    "divide": lambda partial_order, context: divide_and_conquer(partial_order),
+    "bitmask": lambda partial_order, context: bitmask_divide_and_conquer(partial_order),
+    "meet": lambda partial_order, context: meet_in_the_middle(partial_order),
+    "vectorized": lambda partial_order, context: vectorized_count(partial_order),
+    "chains": lambda partial_order, context: chain_count(partial_order),
+    "paper": lambda partial_order, context: _count_reduced(context["paper"]),
+    "paper_triplets": lambda partial_order, context: _count_reduced(context["paper_triplets"]),
+}
+
+
+def estimate_ideals(partial_order, samples=256, seed=0):
+    """
+    Funkcija, ki oceni stevilo idealov delne urejenosti (enako stevilu antiverig) s Knuthovo nepristransko oceno
+    velikosti drevesa. Vozlisca drevesa so antiverige, otroci antiverige S z najvecjim indeksom j pa so antiverige
+    S + {i} za i > j, neprimerljive z vsemi elementi S. Po drevesu gremo po nakljucni poti od korena; ocena je
+    1 + d_1 + d_1 d_2 + ..., kjer je d_k stevilo otrok na k-tem koraku poti.
+    :param partial_order: networkx.DiGraph ali relations.Poset - vozlisca so mnozice tock, povezava u -> v pomeni, da
+                          je u < v
+    :param samples: int - stevilo nakljucnih poti
+    :param seed: int - seme generatorja nakljucnih stevil
+    :return: float - povprecje ocen vseh poti
+    """
+    _, down, up = get_closure_bitmasks(partial_order)
+    n = len(down)
+    # Maska elementov, ki jih po izbiri i ne moremo vec dodati: primerljivi z i in vsi z indeksom do i
+    blocked = [down[i] | up[i] | ((1 << (i + 1)) - 1) for i in range(n)]
+    rng = random.Random(seed)
+
+    total = 0.0
+    for _ in range(samples):
+        estimate = 1.0
+        weight = 1.0
+        allowed = (1 << n) - 1
+        while allowed:
+            children = get_bit_indices(allowed)
+            weight *= len(children)
+            estimate += weight
+            allowed &= ~blocked[rng.choice(children)]
+        total += estimate
+    return total / samples
+
+
+def get_features(partial_order, paper=True, samples=256):
+    """
+    Funkcija, ki izracuna strukturne znacilke delne urejenosti, iz katerih model oceni cas izvajanja strategij.
+    Stevila idealov in stanj so v naravnem logaritmu.
+    :param partial_order: networkx.DiGraph ali relations.Poset - vozlisca so mnozice tock, povezava u -> v pomeni, da
+                          je u < v
+    :param paper: bool - ali izracunamo tudi znacilke korakov algoritma iz clanka (ujemanje, A, reducirana urejenost)
+    :param samples: int - stevilo poti pri oceni stevila idealov
+    :return: (features, context) - slovar znacilk in slovar redukcij iz clanka (paper_reduction), ki ju strategiji
+             paper in paper_triplets uporabita pri stetju
+    """
+    n = partial_order.order()
+    _, _, chains = get_chain_decomposition(partial_order)
+    features = {
+        "size": math.log(n),
+        "ideals": math.log(estimate_ideals(partial_order, samples)),
+        "width": math.log(len(chains)),
+        "chain_states": sum(math.log(len(chain) + 1) for chain in chains),
+    }
+    context = {}
+    if paper:
+        features["matching"] = len(get_maximal_matching(ReachabilityIndex(partial_order))) / n
+        for name, triplets in (("paper", False), ("paper_triplets", True)):
+            reduced, factor, large_case, A_size = context[name] = paper_reduction(partial_order, triplets)
+            features[f"A_{name}"] = A_size / n
+            features[f"ideals_{name}"] = math.log(estimate_ideals(reduced, samples))
+    return features, context
+
+
+def calibrate(benchmark_path, data_dir='../data', samples=256, regularization=1e-3, censored=None):
+    """
+    Funkcija, ki model casov izvajanja umeri na meritvah, kot jih zapise benchmark.run_benchmark. Za vsako strategijo
+    z grebensko regresijo poiscemo utezi, pri katerih je logaritem mediane casa priblizno linearna funkcija znacilk.
+    Napake utezimo s korenom casa, saj je izbira pomembna predvsem pri dragih primerih.
+    :param benchmark_path: String - izhod benchmark.py run (.jsonl ali .csv)
+    :param data_dir: String - mapa z vhodnimi datotekami, ki jih omenjajo meritve
+    :param samples: int - stevilo poti pri oceni stevila idealov
+    :param regularization: float - utez kazni za velikost utezi (brez prostega clena)
+    :param censored: float - cas v sekundah, ki ga pripisemo parom, ki niso koncali (npr. timeout / (repeats + warmup));
+                     None pomeni, da jih izpustimo. Le za .jsonl, saj .csv neuspelih parov ne hrani.
+    :return: dictionary - model, ki ga sprejme Planner
+    """
+    from benchmark import load_records
+
+    measured = {key: np.median(times) / 1e9 for key, times in load_records(benchmark_path).items()}
+    if censored is not None and not benchmark_path.endswith(".csv"):
+        with open(benchmark_path) as f:
+            for line in f:
+                record = json.loads(line)
+                if record["status"] in ("timeout", "oom"):
+                    measured[(record["instance"], record["algorithm"])] = censored
+
+    rows = dict()
+    features = dict()
+    for (instance, algorithm), seconds in measured.items():
+        if algorithm not in FEATURES:
+            continue
+        if instance not in features:
+            features[instance] = get_features(read_poset(os.path.join(data_dir, instance)), samples=samples)[0]
+        x = [1.0] + [features[instance][name] for name in FEATURES[algorithm]]
+        rows.setdefault(algorithm, []).append((x, seconds))
+
+    weights = dict()
+    for algorithm, data in rows.items():
+        X = np.array([x for x, _ in data])
+        seconds = np.array([t for _, t in data])
+        w = np.sqrt(seconds)
+        penalty = regularization * np.eye(X.shape[1])
+        penalty[0, 0] = 0
+        weights[algorithm] = np.linalg.solve(X.T @ (X * w[:, None]) + penalty, X.T @ (np.log(seconds) * w)).tolist()
+    return {"features": {algorithm: FEATURES[algorithm] for algorithm in weights}, "weights": weights,
+            "samples": samples}
+
+
+class Planner:
+    """
+    Stevec, ki za vsako delno urejenost izbere strategijo z najkrajsim napovedanim casom. Delno urejenost najprej
+    razbije na nerazcepne kose (decomposition.decompose) in strategijo izbere za vsak kos posebej. Za vsak kos zapise
+    znacilke, napovedi vseh strategij in dejanski cas izbrane strategije.
+    """
+
+    def __init__(self, model, record_path=None, paper_threshold=0.01):
+        """
+        :param model: dictionary - model, kot ga vrne calibrate
+        :param record_path: String - datoteka, v katero dodajamo zapise (JSON v vsaki vrstici), None pomeni le records
+        :param paper_threshold: float - znacilke iz clanka racunamo le, ce je najkrajsi napovedani cas ostalih
+                                strategij daljsi od tega (v sekundah), saj se pri hitrih primerih ne izplacajo
+        """
+        self.model = model
+        self.record_path = record_path
+        self.paper_threshold = paper_threshold
+        self.records = []
+
+    @classmethod
+    def load(cls, path='../results/cost_model.json', **kwargs):
+        """
+        Funkcija, ki prebere model, shranjen s save
+        """
+        with open(path) as f:
+            return cls(json.load(f), **kwargs)
+
+    def save(self, path='../results/cost_model.json'):
+        with open(path, "w") as f:
+            json.dump(self.model, f, indent=1)
+
+    def predict(self, features, strategies=None):
+        """
+        Funkcija, ki iz znacilk napove cas izvajanja strategij
+        :param features: dictionary - znacilke, kot jih vrne get_features
+        :param strategies: String list - strategije, privzeto vse iz modela, za katere imamo vse znacilke
+        :return: dictionary - strategija -> napovedan cas v sekundah
+        """
+        if strategies is None:
+            strategies = self.model["weights"]
+        predictions = dict()
+        for strategy in strategies:
+            names = self.model["features"][strategy]
+            if all(name in features for name in names):
+                x = [1.0] + [features[name] for name in names]
+                predictions[strategy] = math.exp(float(np.dot(self.model["weights"][strategy], x)))
+        return predictions
+
+    def plan(self, partial_order):
+        """
+        Funkcija, ki izbere strategijo za nerazcepno delno urejenost
+        :return: (strategy, predictions, features, context)
+        """
+        features, context = get_features(partial_order, paper=False, samples=self.model["samples"])
+        predictions = self.predict(features)
+        if any(strategy in self.model["weights"] for strategy in PAPER_STRATEGIES) and \
+                (not predictions or min(predictions.values()) > self.paper_threshold):
+            features, context = get_features(partial_order, samples=self.model["samples"])
+            predictions = self.predict(features)
+        return min(predictions, key=predictions.get), predictions, features, context
+
+    def count(self, partial_order):
+        """
+        Funkcija, ki presteje linearne razsiritve z izbranimi strategijami in zapise napovedi ter dejanske case
+        :param partial_order: networkx.DiGraph ali relations.Poset - vozlisca so mnozice tock, povezava u -> v pomeni,
+                              da je u < v
+        :return: Stevilo linearnih razsiritev
+        """
+        linear_extensions, pieces = decompose(partial_order)
+        for piece in pieces:
+            if piece.order() <= 1:
+                continue
+            start = time.perf_counter()
+            strategy, predictions, features, context = self.plan(piece)
+            planned = time.perf_counter()
+            linear_extensions *= STRATEGIES[strategy](piece, context)
+            record = {"n": piece.order(), "pieces": len(pieces), "strategy": strategy, "predicted": predictions,
+                      "time": time.perf_counter() - planned, "planning_time": planned - start, "features": features}
+            self.records.append(record)
+            if self.record_path is not None:
+                with open(self.record_path, "a") as f:
+                    f.write(json.dumps(record) + "\n")
+        return linear_extensions
+
+    def __call__(self, partial_order):
+        return self.count(partial_order)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Izbira strategije stetja linearnih razsiritev z modelom casov")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    calibrate_parser = subparsers.add_parser("calibrate")
+    calibrate_parser.add_argument("benchmark", help="izhod benchmark.py run")
+    calibrate_parser.add_argument("--data", default="../data")
+    calibrate_parser.add_argument("--model", default="../results/cost_model.json")
+    calibrate_parser.add_argument("--samples", type=int, default=256)
+    calibrate_parser.add_argument("--censored", type=float, default=None,
+                                  help="cas v sekundah za pare, ki niso koncali (timeout / (repeats + warmup))")
+
+    count_parser = subparsers.add_parser("count")
+    count_parser.add_argument("paths", nargs="+")
+    count_parser.add_argument("--model", default="../results/cost_model.json")
+    count_parser.add_argument("--records", default="../results/planner.jsonl")
+
+    args = parser.parse_args()
+    if args.command == "calibrate":
+        Planner(calibrate(args.benchmark, args.data, args.samples, censored=args.censored)).save(args.model)
+    else:
+        planner = Planner.load(args.model, record_path=args.records)
+        for path in args.paths:
+            done = len(planner.records)
+            count = planner.count(read_poset(path))
+            # Izbrane strategije za vse kose primera
+            print(path, count, " ".join(record["strategy"] for record in planner.records[done:]), flush=True)
@@ -0,0 +1,364 @@
+import numpy as np
+import networkx as nx
+
+
+def get_bitmasks(partial_order):
+    """
+    Funkcija, ki vozlisca delne urejenosti oznaci z zaporednimi indeksi in za vsako vozlisce zgradi bitno masko
+    predhodnikov in naslednikov
+    :param partial_order: networkx.DiGraph - vozlisca so mnozice tock, povezava u -> v pomeni, da je u < v
+    :return: (nodes, predecessors, successors) - seznam vozlisc (i-to vozlisce ima bit 1 << i), seznam mask predhodnikov
+             in seznam mask naslednikov
+    """
+    # Poset ze hrani maske (tranzitivne ovojnice), zato jih le vrnemo
+    if isinstance(partial_order, Poset):
+        return partial_order.bitmasks()
+    nodes = list(partial_order.nodes())
+    index = {node: i for i, node in enumerate(nodes)}
+    predecessors = [0] * len(nodes)
+    successors = [0] * len(nodes)
+    for u, v in partial_order.edges():
+        predecessors[index[v]] |= 1 << index[u]
+        successors[index[u]] |= 1 << index[v]
+    return nodes, predecessors, successors
+
+
+def get_bit_indices(mask):
+    """
+    Funkcija, ki vrne seznam indeksov prizganih bitov v maski
+    :param mask: int - bitna maska
+    :return: int list - indeksi v narascajocem vrstnem redu
+    """
+    indices = []
+    while mask:
+        bit = mask & -mask
+        mask ^= bit
+        indices.append(bit.bit_length() - 1)
+    return indices
+
+
+def get_closure_bitmasks(partial_order):
+    """
+    Funkcija, ki za vsako vozlisce izracuna bitni maski vseh manjsih in vseh vecjih elementov (tranzitivna ovojnica)
+    :param partial_order: networkx.DiGraph - vozlisca so mnozice tock, povezava u -> v pomeni, da je u < v
+    :return: (labels, down, up) - seznam vozlisc (i-to vozlisce ima bit 1 << i), maske manjsih in maske vecjih elementov
+    """
+    if isinstance(partial_order, Poset):
+        return partial_order.bitmasks()
+    labels = list(partial_order.nodes())
+    index = {node: i for i, node in enumerate(labels)}
+    down = [0] * len(labels)
+    # V topoloski ureditvi so vsi predhodniki obdelani pred vozliscem
+    for node in nx.topological_sort(partial_order):
+        i = index[node]
+        for pred in partial_order.predecessors(node):
+            j = index[pred]
+            down[i] |= down[j] | (1 << j)
+    return labels, down, _transpose(down)
+
+
+def _transpose(masks):
+    """
+    Funkcija, ki iz mask manjsih elementov izracuna maske vecjih elementov (ali obratno)
+    """
+    transposed = [0] * len(masks)
+    for i, mask in enumerate(masks):
+        while mask:
+            bit = mask & -mask
+            mask ^= bit
+            transposed[bit.bit_length() - 1] |= 1 << i
+    return transposed
+
+
+def _close(predecessors):
+    """
+    Funkcija, ki iz mask predhodnikov izracuna maske vseh manjsih elementov (tranzitivna ovojnica). Elemente obdelamo
+    v plasteh: element je na vrsti, ko so obdelani vsi njegovi predhodniki.
+    :param predecessors: int list - maske predhodnikov
+    :return: int list - maske manjsih elementov
+    """
+    down = [0] * len(predecessors)
+    done = 0
+    remaining = (1 << len(predecessors)) - 1
+    while remaining:
+        ready = [i for i in get_bit_indices(remaining) if predecessors[i] & ~done == 0]
+        if not ready:
+            raise nx.NetworkXUnfeasible("Primerjave vsebujejo cikel")
+        for i in ready:
+            mask = predecessors[i]
+            for j in get_bit_indices(mask):
+                mask |= down[j]
+            down[i] = mask
+            done |= 1 << i
+        remaining &= ~done
+    return down
+
+
+def get_cover_bitmasks(up):
+    """
+    Funkcija, ki iz mask vecjih elementov izracuna maske pokritij (y pokrije x, ce x < y in med njima ni elementa)
+    :param up: int list - maske vecjih elementov (tranzitivna ovojnica)
+    :return: int list - maske elementov, ki pokrijejo posamezen element
+    """
+    covers = []
+    for mask in up:
+        # Element je pokritje, ce ni vecji od nobenega drugega elementa iz mask
+        reachable = 0
+        rest = mask
+        while rest:
+            bit = rest & -rest
+            rest ^= bit
+            reachable |= up[bit.bit_length() - 1]
+        covers.append(mask & ~reachable)
+    return covers
+
+
+def get_bitmask_matrix(masks):
+    """
+    Funkcija, ki bitne maske razpakira v vrstice matrike
+    :param masks: int list - bitne maske dolzine n
+    :return: 2D numpy array tipa bool oblike (n, n) - element [i, j] je j-ti bit maske masks[i]
+    """
+    n = len(masks)
+    size = (n + 7) // 8
+    packed = np.frombuffer(b''.join(mask.to_bytes(size, 'little') for mask in masks), dtype=np.uint8)
+    return np.unpackbits(packed.reshape(n, size), axis=1, count=n, bitorder='little').astype(bool)
+
+
+def get_less_matrix(partial_order):
+    """
+    Funkcija, ki vrne matriko primerjav prisotnih elementov v vrstnem redu get_closure_bitmasks. Pri Poset uporabi
+    njegovo matriko less, ki se izracuna le enkrat.
+    :param partial_order: networkx.DiGraph ali Poset - povezava u -> v pomeni, da je u < v
+    :return: 2D numpy array tipa bool - element [i, j] pove, ali je i < j
+    """
+    if isinstance(partial_order, Poset):
+        if partial_order.mask == (1 << len(partial_order.labels)) - 1:
+            return partial_order.less
+        elements = get_bit_indices(partial_order.mask)
+        return partial_order.less[np.ix_(elements, elements)]
+    _, _, up = get_closure_bitmasks(partial_order)
+    return get_bitmask_matrix(up)
+
+
+class ReachabilityIndex:
+    """
+    Indeks primerljivosti, ki odgovori na vprasanje (u, v) in index (ali je u < v) v konstantnem casu. Nadomesti mnozico
+    vseh povezav tranzitivne ovojnice, zato deluje tudi, ce graf vsebuje le pokritja.
+    """
+
+    def __init__(self, partial_order):
+        """
+        :param partial_order: networkx.DiGraph - vozlisca so mnozice tock, povezava u -> v pomeni, da je u < v
+        """
+        self.labels, self.down, self.up = get_closure_bitmasks(partial_order)
+        self.index = {node: i for i, node in enumerate(self.labels)}
+        # Poset matriko primerjav izracuna le enkrat in si jo deli z vsemi zozitvami
+        self.poset = partial_order if isinstance(partial_order, Poset) else None
+        self.matrix = None
+
+    def __contains__(self, edge):
+        u, v = edge
+        return (self.up[self.index[u]] >> self.index[v]) & 1 == 1
+
+    def comparable(self, u, v):
+        """
+        Funkcija, ki preveri, ali sta elementa primerljiva (u < v ali v < u)
+        """
+        i = self.index[u]
+        return ((self.up[i] | self.down[i]) >> self.index[v]) & 1 == 1
+
+    def comparability_matrix(self):
+        """
+        Funkcija, ki vrne matriko primerljivosti, izracunano ob prvem klicu
+        :return: 2D numpy array tipa bool - C[i, j] pove, ali sta elementa z indeksoma i in j primerljiva
+        """
+        if self.matrix is None:
+            up = get_less_matrix(self.poset) if self.poset is not None else get_bitmask_matrix(self.up)
+            self.matrix = up | up.T
+        return self.matrix
+
+    def positions(self, nodes):
+        """
+        Funkcija, ki vrne indekse vozlisc kot numpy tabelo
+        """
+        return np.array([self.index[node] for node in nodes], dtype=np.intp)
+
+
+def transitive_reduction(partial_order, index=None):
+    """
+    Funkcija, ki vrne nov graf, ki vsebuje le pokritja (tranzitivna redukcija) podane delne urejenosti
+    :param partial_order: networkx.DiGraph - vozlisca so mnozice tock, povezava u -> v pomeni, da je u < v
+    :param index: ReachabilityIndex - ze izracunan indeks primerljivosti, da se izognemo ponovnemu racunanju
+    :return: networkx.DiGraph - graf pokritij z enakim vrstnim redom vozlisc
+    """
+    if index is None:
+        index = ReachabilityIndex(partial_order)
+    labels = index.labels
+
+    reduced = nx.DiGraph()
+    reduced.add_nodes_from(labels)
+    for i, mask in enumerate(get_cover_bitmasks(index.up)):
+        while mask:
+            bit = mask & -mask
+            mask ^= bit
+            reduced.add_edge(labels[i], labels[bit.bit_length() - 1])
+    return reduced
+
+
+class Poset:
+    """
+    Nespremenljiva delna urejenost. Elementi imajo zaporedne indekse 0, ..., n - 1 (oznake so v labels), za vsak
+    element hranimo bitni maski vseh manjsih in vseh vecjih elementov (tranzitivna ovojnica), matrika less pa pove,
+    ali je i < j; izracunamo jo sele ob prvi uporabi. Zozitev na podmnozico (restrict) zamenja le masko prisotnih
+    elementov, tabele (tudi matriko less) pa si deli z izvirnikom, zato je ni treba kopirati. Za module, ki
+    potrebujejo networkx, sta na voljo from_graph in to_graph, ostali algoritmi pa preko get_bitmasks in
+    get_closure_bitmasks Poset sprejmejo namesto grafa.
+    """
+
+    __slots__ = ("labels", "index", "down", "up", "mask", "_less")
+
+    def __init__(self, labels, down, up=None):
+        """
+        :param labels: list - oznake elementov, i-ti element ima bit 1 << i
+        :param down: int list - maske manjsih elementov (tranzitivna ovojnica)
+        :param up: int list - maske vecjih elementov, privzeto izracunane iz down
+        """
+        labels = tuple(labels)
+        up = tuple(_transpose(down)) if up is None else tuple(up)
+        # Matriko less hranimo v seznamu, ki si ga delijo vse zozitve, da jo izracunamo najvec enkrat
+        for name, value in (("labels", labels), ("index", {node: i for i, node in enumerate(labels)}),
+                            ("down", tuple(down)), ("up", up), ("mask", (1 << len(labels)) - 1), ("_less", [None])):
+            object.__setattr__(self, name, value)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Poset je nespremenljiv")
+
+    @property
+    def less(self):
+        """
+        Matrika primerjav vseh elementov (tudi tistih zunaj zozitve), izracunana ob prvi uporabi
+        :return: 2D numpy array tipa bool - element [i, j] pove, ali je i < j
+        """
+        if self._less[0] is None:
+            less = get_bitmask_matrix(self.up) if self.labels else np.zeros((0, 0), dtype=bool)
+            less.setflags(write=False)
+            self._less[0] = less
+        return self._less[0]
+
+    @classmethod
+    def from_edges(cls, n, edges):
+        """
+        Funkcija, ki ustvari delno urejenost iz tabele primerjav, kot jo vrne data_preparation.read_edges
+        :param n: int - velikost mnozice
+        :param edges: 2D numpy array oblike (m, 2) - primerjave u v (u < v, indeksirano z 1)
+        :return: Poset - elementi so oznaceni z 1, ..., n
+        """
+        predecessors = [0] * n
+        for u, v in edges.tolist():
+            predecessors[v - 1] |= 1 << (u - 1)
+        return cls(range(1, n + 1), _close(predecessors))
+
+    @classmethod
+    def from_graph(cls, partial_order):
+        """
+        Funkcija, ki ustvari delno urejenost iz usmerjenega grafa (povezava u -> v pomeni, da je u < v)
+        """
+        return cls(*get_closure_bitmasks(partial_order))
+
+    def to_graph(self, reduction=False):
+        """
+        Funkcija, ki delno urejenost pretvori v usmerjen graf, kot ga vrne data_preparation.create_graph
+        :param reduction: boolean - ali graf vsebuje le pokritja namesto vseh primerjav
+        :return: networkx.DiGraph - usmerjen graf, v katerem povezava u -> v pomeni, da je u < v
+        """
+        labels, _, up = self.bitmasks()
+        g = nx.DiGraph()
+        g.add_nodes_from(labels)
+        for i, mask in enumerate(get_cover_bitmasks(up) if reduction else up):
+            for j in get_bit_indices(mask):
+                g.add_edge(labels[i], labels[j])
+        return g
+
+    def restrict(self, mask):
+        """
+        Funkcija, ki vrne zozitev na elemente z indeksi v maski, ne da bi kopirala tabele
+        :param mask: int - bitna maska indeksov elementov
+        :return: Poset - zozena delna urejenost
+        """
+        view = object.__new__(Poset)
+        for name in ("labels", "index", "down", "up", "_less"):
+            object.__setattr__(view, name, getattr(self, name))
+        object.__setattr__(view, "mask", mask & self.mask)
+        return view
+
+    def add_chains(self, chains):
+        """
+        Funkcija, ki vrne novo delno urejenost, v kateri so elementi vsake verige dodatno urejeni v podanem vrstnem redu
+        :param chains: list of lists - verige oznak elementov
+        :return: Poset - delna urejenost z dodanimi primerjavami in njihovo tranzitivno ovojnico
+        """
+        predecessors = list(self.down)
+        for chain in chains:
+            for u, v in zip(chain, chain[1:]):
+                predecessors[self.index[v]] |= 1 << self.index[u]
+        view = Poset(self.labels, _close(predecessors))
+        return view if self.mask == view.mask else view.restrict(self.mask)
+
+    def bitmasks(self):
+        """
+        Funkcija, ki vrne oznake ter maske manjsih in vecjih elementov prisotnih elementov, ponovno oznacenih z
+        zaporednimi indeksi (enako kot get_closure_bitmasks)
+        """
+        if self.mask == (1 << len(self.labels)) - 1:
+            return list(self.labels), list(self.down), list(self.up)
+        elements = get_bit_indices(self.mask)
+        position = {e: i for i, e in enumerate(elements)}
+
+        def compress(m):
+            result = 0
+            for e in get_bit_indices(m & self.mask):
+                result |= 1 << position[e]
+            return result
+
+        return [self.labels[e] for e in elements], [compress(self.down[e]) for e in elements], \
+            [compress(self.up[e]) for e in elements]
+
+    def order(self):
+        return bin(self.mask).count("1")
+
+    def number_of_nodes(self):
+        return self.order()
+
+    def number_of_edges(self):
+        return sum(bin(self.up[i] & self.mask).count("1") for i in get_bit_indices(self.mask))
+
+    def __len__(self):
+        return self.order()
+
+    def __iter__(self):
+        return (self.labels[i] for i in get_bit_indices(self.mask))
+
+    def __contains__(self, node):
+        i = self.index.get(node)
+        return i is not None and (self.mask >> i) & 1 == 1
+
+    def nodes(self):
+        return list(self)
+
+    def edges(self):
+        """
+        Funkcija, ki vrne vse primerjave (u, v), u < v, med prisotnimi elementi
+        """
+        return [(self.labels[i], self.labels[j]) for i in get_bit_indices(self.mask)
+                for j in get_bit_indices(self.up[i] & self.mask)]
+
+    def predecessors(self, node):
+        return [self.labels[j] for j in get_bit_indices(self.down[self.index[node]] & self.mask)]
+
+    def successors(self, node):
+        return [self.labels[j] for j in get_bit_indices(self.up[self.index[node]] & self.mask)]
+
+    def copy(self):
+        # Nespremenljivega objekta ni treba kopirati
+        return self
@@ -0,0 +1,110 @@
+import random
+import numpy as np
+
+from algorithms import bitmask_divide_and_conquer
+from relations import get_bitmasks
+
+
+class LinearExtensionSampler:
+    """
+    Enakomerno vzorcenje linearnih razsiritev. Stevila linearnih razsiritev vseh idealov izracunamo enkrat
+    (bitmask_divide_and_conquer) in jih obdrzimo. Vzorec dobimo tako, da od celotne mnozice navzdol izbiramo
+    maksimalne elemente ideala I, element x z verjetnostjo e(I - x) / e(I), in ga postavimo na zadnje prosto mesto.
+    Za vsak ideal hranimo njegove maksimalne elemente in indekse idealov, ki ostanejo, zato je vsako mesto vzorca le
+    izbira iz tabele.
+    """
+
+    def __init__(self, partial_order, seed=None):
+        """
+        :param partial_order: networkx.DiGraph - vozlisca so mnozice tock, povezava u -> v pomeni, da je u < v
+        :param seed: int - seme generatorjev nakljucnih stevil
+        """
+        nodes, _, successors = get_bitmasks(partial_order)
+        n = len(nodes)
+        self.labels = np.array(nodes)
+        self.n = n
+
+        memo = {}
+        self.count = bitmask_divide_and_conquer(partial_order, memo)
+        if n <= 1:
+            memo = {0: 1, (1 << n) - 1: 1}
+
+        # Ideale ostevilcimo, za ideal z indeksom i so prehodi na mestih offsets[i]:offsets[i + 1]
+        ideals = list(memo)
+        ids = {ideal: i for i, ideal in enumerate(ideals)}
+        self.counts = [memo[ideal] for ideal in ideals]
+        self.full = ids[(1 << n) - 1]
+        offsets = [0]
+        elements = []
+        children = []
+        keys = []
+        for i, ideal in enumerate(ideals):
+            total = self.counts[i]
+            cumulative = 0
+            mask = ideal
+            while mask:
+                bit = mask & -mask
+                mask ^= bit
+                x = bit.bit_length() - 1
+                # x je maksimalen, ce v idealu ni nobenega njegovega naslednika
+                if successors[x] & ideal == 0:
+                    child = ids[ideal ^ bit]
+                    cumulative += self.counts[child]
+                    elements.append(x)
+                    children.append(child)
+                    # Kljuc je indeks ideala in kumulativna verjetnost, tako da en searchsorted izbere prehod za vse
+                    # vzorce hkrati
+                    keys.append(i + cumulative / total)
+            if offsets[-1] != len(keys):
+                keys[-1] = i + 1.0
+            offsets.append(len(keys))
+
+        self.offsets = np.array(offsets, dtype=np.int64)
+        self.elements = np.array(elements, dtype=np.int64)
+        self.children = np.array(children, dtype=np.int64)
+        self.keys = np.array(keys, dtype=np.float64)
+        self.random = random.Random(seed)
+        self.rng = np.random.default_rng(seed)
+
+    def sample(self):
+        """
+        Funkcija, ki vrne en tocno enakomeren vzorec (izbire so izracunane s celimi stevili)
+        :return: list - vozlisca v vrstnem redu linearne razsiritve
+        """
+        extension = [None] * self.n
+        ideal = self.full
+        for position in range(self.n - 1, -1, -1):
+            r = self.random.randrange(self.counts[ideal])
+            for j in range(self.offsets[ideal], self.offsets[ideal + 1]):
+                child = self.children[j]
+                if r < self.counts[child]:
+                    break
+                r -= self.counts[child]
+            extension[position] = self.labels[self.elements[j]].item()
+            ideal = child
+        return extension
+
+    def sample_batch(self, size):
+        """
+        Funkcija, ki hkrati vzorci size linearnih razsiritev. Na vsakem mestu izbiro za vse vzorce opravimo z enim
+        iskanjem po tabeli kljucev, zato so verjetnosti izbir tocne do natancnosti stevil s plavajoco vejico.
+        :param size: int - stevilo vzorcev
+        :return: 2D numpy array oblike (size, n) - vsaka vrstica je linearna razsiritev (oznake vozlisc)
+        """
+        extensions = np.empty((size, self.n), dtype=np.int64)
+        current = np.full(size, self.full, dtype=np.int64)
+        for position in range(self.n - 1, -1, -1):
+            j = np.searchsorted(self.keys, current + self.rng.random(size), side='right')
+            # Zaokrozevanje current + u navzgor ne sme preskociti v prehode naslednjega ideala
+            j = np.minimum(j, self.offsets[current + 1] - 1)
+            extensions[:, position] = self.elements[j]
+            current = self.children[j]
+        return self.labels[extensions]
+
+    def stream(self, batch_size=10000):
+        """
+        Generator, ki v nedogled vraca linearne razsiritve, vzorcene po paketih velikosti batch_size
+        """
+        while True:
+            for extension in self.sample_batch(batch_size):
+                yield extension
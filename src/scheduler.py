@@ -0,0 +1,117 @@
+import os
+import time
+import signal
+import multiprocessing as mp
+from multiprocessing.connection import wait
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+# Funkcija execute je navadno gnezdena funkcija, ki je ni mogoce serializirati, zato procese ustvarjamo z fork, kjer
+# je na voljo; drugje (Windows) mora biti execute funkcija na nivoju modula
+_context = mp.get_context("fork") if "fork" in mp.get_all_start_methods() else mp.get_context()
+
+
+def get_cores():
+    """
+    Funkcija, ki vrne seznam jeder, na katerih lahko tece trenutni proces
+    :return: int list - indeksi jeder
+    """
+    if hasattr(os, "sched_getaffinity"):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count()))
+
+
+def _run_job(execute, job, core, memory_limit, connection):
+    """
+    Funkcija, ki se izvede v locenem procesu: proces pripne na jedro, omeji njegov pomnilnik in poslje rezultat posla
+    """
+    if core is not None and hasattr(os, "sched_setaffinity"):
+        os.sched_setaffinity(0, {core})
+    if memory_limit is not None and resource is not None:
+        resource.setrlimit(resource.RLIMIT_AS, (memory_limit, memory_limit))
+
+    try:
+        result = execute(job)
+    except MemoryError:
+        result = {"status": "oom"}
+    except Exception as e:
+        result = {"status": "error", "message": repr(e)}
+    connection.send(result)
+    connection.close()
+
+
+def run_jobs(jobs, execute, processes=None, timeout=None, memory_limit=None, callback=None):
+    """
+    Funkcija, ki izvede seznam poslov. Ce je podano stevilo procesov, vsak posel tece v svojem procesu, pripetem na
+    svoje jedro, hkrati pa tece najvec toliko poslov. Posel, ki preseze casovno omejitev, prekinemo in ga oznacimo s
+    statusom "timeout"; posel, ki mu zmanjka pomnilnika (MemoryError ali SIGKILL ob omejenem pomnilniku), dobi status
+    "oom". Posel, katerega proces se konca brez rezultata iz drugega razloga, dobi status "crashed" z izhodno kodo,
+    posel, ki sprozi izjemo, pa status "error".
+    :param jobs: list of dictionaries - opisi poslov
+    :param execute: function - funkcija, ki za opis posla vrne slovar z rezultatom (in kljucem "status")
+    :param processes: int - stevilo hkratnih procesov, None pomeni zaporedno izvajanje v trenutnem procesu
+    :param timeout: float - najdaljsi cas izvajanja posla v sekundah
+    :param memory_limit: int - najvec pomnilnika (v bajtih), ki ga lahko porabi posel
+    :param callback: function - ce je podana, jo poklicemo z rezultatom vsakega posla takoj, ko se konca
+    :return: list of dictionaries - rezultati v enakem vrstnem redu kot posli, vsak dopolnjen z opisom posla
+    """
+    if processes is None:
+        results = []
+        for job in jobs:
+            results.append({**job, **execute(job)})
+            if callback is not None:
+                callback(results[-1])
+        return results
+
+    free_cores = get_cores()[:processes]
+    pending = list(enumerate(jobs))
+    running = dict()
+    results = [None] * len(jobs)
+
+    while pending or running:
+        # Zapolnimo prosta jedra
+        while pending and free_cores:
+            core = free_cores.pop()
+            i, job = pending.pop(0)
+            receiver, sender = _context.Pipe(duplex=False)
+            process = _context.Process(target=_run_job, args=(execute, job, core, memory_limit, sender))
+            process.start()
+            sender.close()
+            running[core] = (i, process, receiver, time.perf_counter())
+
+        # Pocakamo na prvi koncan posel ali na potek casovne omejitve
+        wait([receiver for _, _, receiver, _ in running.values()] +
+             [process.sentinel for _, process, _, _ in running.values()], timeout=0.1)
+
+        for core, (i, process, receiver, start) in list(running.items()):
+            result = None
+            # Ce proces ni vec ziv, je njegov rezultat ze v cevi
+            alive = process.is_alive()
+            if receiver.poll():
+                try:
+                    result = receiver.recv()
+                except EOFError:
+                    result = None
+            if result is None and not alive:
+                # Proces je koncal brez rezultata; ce ga je ob omejenem pomnilniku ustavil sistem, mu je zmanjkalo
+                # pomnilnika, sicer se je sesul
+                if memory_limit is not None and process.exitcode == -signal.SIGKILL:
+                    result = {"status": "oom", "exitcode": process.exitcode}
+                else:
+                    result = {"status": "crashed", "exitcode": process.exitcode}
+            if result is None and timeout is not None and time.perf_counter() - start > timeout:
+                process.terminate()
+                result = {"status": "timeout"}
+            if result is not None:
+                process.join()
+                receiver.close()
+                results[i] = {**jobs[i], **result}
+                if callback is not None:
+                    callback(results[i])
+                del running[core]
+                free_cores.append(core)
+
+    return results
@@ -0,0 +1,137 @@
+import math
+import numpy as np
+
+from relations import get_bitmasks
+
+
+def _is_prime(p):
+    """
+    Deterministicen Miller-Rabinov test (pravilen za p < 3.3 * 10^24)
+    """
+    if p < 2:
+        return False
+    bases = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41)
+    for b in bases:
+        if p % b == 0:
+            return p == b
+    d, s = p - 1, 0
+    while d % 2 == 0:
+        d //= 2
+        s += 1
+    for b in bases:
+        x = pow(b, d, p)
+        if x in (1, p - 1):
+            continue
+        for _ in range(s - 1):
+            x = x * x % p
+            if x == p - 1:
+                break
+        else:
+            return False
+    return True
+
+
+def get_primes(count, bits=55):
+    """
+    Funkcija, ki vrne count najvecjih prastevil, manjsih od 2^bits. Vsota najvec 2^(63 - bits) ostankov se tako
+    se vedno prilega v int64.
+    :param count: int - stevilo prastevil
+    :param bits: int - najvecje stevilo bitov prastevila
+    :return: int list - prastevila v padajocem vrstnem redu
+    """
+    primes = []
+    p = (1 << bits) - 1
+    while len(primes) < count:
+        if _is_prime(p):
+            primes.append(p)
+        p -= 2
+    return primes
+
+
+def crt(residues, primes):
+    """
+    Funkcija, ki iz ostankov po paroma tujih modulih s kitajskim izrekom o ostankih rekonstruira najmanjse nenegativno
+    stevilo
+    :param residues: int list - ostanki
+    :param primes: int list - moduli
+    :return: int - stevilo x, 0 <= x < produkt modulov, z x % p = r za vse pare (r, p)
+    """
+    modulus = math.prod(primes)
+    x = 0
+    for r, p in zip(residues, primes):
+        m = modulus // p
+        x += int(r) * m * pow(m, -1, p)
+    return x % modulus
+
+
+def _aggregate(ideals, residues, primes):
+    """
+    Funkcija, ki uredi ideale in sesteje ostanke enakih idealov
+    :param ideals: 2D numpy array tipa uint64 oblike (k, W) - ideali kot bitne maske po W besed
+    :param residues: 2D numpy array tipa int64 oblike (k, P) - ostanki stevil za vsak ideal
+    :param primes: 1D numpy array tipa int64 - moduli
+    :return: (2D numpy array, 2D numpy array) - razlicni ideali in vsote njihovih ostankov
+    """
+    if ideals.shape[1] == 1:
+        order = np.argsort(ideals[:, 0], kind="stable")
+    else:
+        order = np.lexsort(ideals.T[::-1])
+    ideals = ideals[order]
+    residues = residues[order]
+    starts = np.flatnonzero(np.concatenate(([True], np.any(ideals[1:] != ideals[:-1], axis=1))))
+    return ideals[starts], np.add.reduceat(residues, starts, axis=0) % primes
+
+
+def vectorized_count(partial_order, primes=None, stats=None):
+    """
+    Stetje linearnih razsiritev nivo po nivoju mreze idealov z operacijami nad numpy tabelami. Ideali nivoja so bitne
+    maske v tabeli tipa uint64 (po ceil(n / 64) besed na ideal), stevila pa hranimo kot ostanke po vec prastevilih
+    (int64), da se izognemo velikim celim stevilom. Naslednji nivo dobimo tako, da za vsak element x izberemo ideale,
+    ki jih x lahko razsiri, enake ideale pa zdruzimo z urejanjem. Tocno stevilo na koncu rekonstruiramo s kitajskim
+    izrekom o ostankih; prastevil je dovolj, da je njihov produkt vecji od n!.
+    :param partial_order: networkx.DiGraph - vozlisca so mnozice tock, povezava u -> v pomeni, da je u < v
+    :param primes: int list - moduli, privzeto dovolj prastevil iz get_primes
+    :param stats: dictionary - stevci instrumentacije (Instrumentation.counters), None pomeni brez stetja
+    :return: Stevilo linearnih razsiritev
+    """
+    n = partial_order.order()
+    if n <= 1:
+        return 1
+    if primes is None:
+        # Produkt prastevil (vsako vecje od 2^54) mora preseci n! >= e(P)
+        primes = get_primes(math.ceil((math.lgamma(n + 1) / math.log(2) + 1) / 54))
+
+    _, predecessors, _ = get_bitmasks(partial_order)
+    words = (n + 63) // 64
+    word_mask = (1 << 64) - 1
+    required = np.array([[(mask >> (64 * w)) & word_mask for w in range(words)] for mask in predecessors],
+                        dtype=np.uint64)
+    modulus = np.array(primes, dtype=np.int64)
+
+    ideals = np.zeros((1, words), dtype=np.uint64)
+    residues = np.ones((1, len(primes)), dtype=np.int64)
+    for _ in range(n):
+        new_ideals = []
+        new_residues = []
+        branches = np.zeros(len(ideals), dtype=np.int64)
+        for x in range(n):
+            word, bit = divmod(x, 64)
+            # x lahko dodamo, ce ga ideal se ne vsebuje in vsebuje vse njegove predhodnike
+            free = (ideals[:, word] >> np.uint64(bit)) & np.uint64(1) == 0
+            ready = np.all(ideals & required[x] == required[x], axis=1)
+            extendable = free & ready
+            extended = ideals[extendable]
+            extended[:, word] |= np.uint64(1 << bit)
+            new_ideals.append(extended)
+            new_residues.append(residues[extendable])
+            branches += extendable
+
+        if stats is not None:
+            stats["states"] += len(ideals)
+            stats["branches"] += int(branches.sum())
+            stats["max_branches"] = max(stats["max_branches"], int(branches.max()))
+        ideals, residues = _aggregate(np.concatenate(new_ideals), np.concatenate(new_residues), modulus)
+        if stats is not None:
+            stats["peak_memo"] = max(stats["peak_memo"], len(ideals))
+
+    return crt(residues[0].tolist(), primes)
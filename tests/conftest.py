@@ -0,0 +1,61 @@
+import os
+import sys
+import random
+import shutil
+from itertools import combinations, permutations
+
+import matplotlib
+import networkx as nx
+import pytest
+
+matplotlib.use("Agg")
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA = os.path.join(ROOT, "data")
+sys.path.insert(0, os.path.join(ROOT, "src"))
+
+
+@pytest.fixture
+def workdir(tmp_path, monkeypatch):
+    """
+    Zacasna kopija strukture repozitorija (src, data, results), saj moduli uporabljajo relativne poti '../data' in
+    '../results'. Vrne funkcijo, ki v zacasno mapo data kopira podane vhodne datoteke.
+    """
+    (tmp_path / "src").mkdir()
+    (tmp_path / "data").mkdir()
+    (tmp_path / "results").mkdir()
+    monkeypatch.chdir(tmp_path / "src")
+
+    def copy(*names):
+        for name in names:
+            shutil.copy(os.path.join(DATA, name), tmp_path / "data" / name)
+        return tmp_path
+
+    return copy
+
+
+def random_dag(n, p, seed):
+    """
+    Nakljucna delna urejenost na vozliscih 1, ..., n: vsak par i < j je primerljiv z verjetnostjo p, vozlisca pa so
+    nakljucno preimenovana, da njihov vrstni red ni ze linearna razsiritev.
+    """
+    rng = random.Random(seed)
+    labels = list(range(1, n + 1))
+    rng.shuffle(labels)
+    g = nx.DiGraph()
+    g.add_nodes_from(range(1, n + 1))
+    g.add_edges_from((labels[i], labels[j]) for i, j in combinations(range(n), 2) if rng.random() < p)
+    return g
+
+
+def brute_force(partial_order):
+    """
+    Stevilo linearnih razsiritev, presteto s pregledom vseh permutacij (le za majhne n)
+    """
+    nodes = list(partial_order.nodes())
+    edges = list(partial_order.edges())
+    count = 0
+    for order in permutations(nodes):
+        position = {node: i for i, node in enumerate(order)}
+        count += all(position[u] < position[v] for u, v in edges)
+    return count
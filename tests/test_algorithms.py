@@ -0,0 +1,43 @@
+import os
+
+import pytest
+
+from algorithms import divide_and_conquer, bitmask_divide_and_conquer, meet_in_the_middle
+from instrumentation import Instrumentation
+from data_preparation import create_graph
+from relations import Poset
+
+from conftest import DATA, random_dag, brute_force
+
+
+@pytest.mark.parametrize("p", [0.0, 0.2, 0.5, 1.0])
+def test_engines_match_brute_force(p):
+    for seed in range(10):
+        g = random_dag(7, p, seed)
+        expected = brute_force(g)
+        assert divide_and_conquer(g.copy()) == expected
+        assert bitmask_divide_and_conquer(g) == expected
+        assert bitmask_divide_and_conquer(Poset.from_graph(g)) == expected
+
+
+def test_engines_agree_on_data():
+    for name in ["vhod_10_1.txt", "vhod_15_2.txt", "vhod_20_3.txt", "vhod_antichain_10_5.txt"]:
+        g = create_graph(os.path.join(DATA, name))
+        assert divide_and_conquer(g.copy()) == bitmask_divide_and_conquer(g)
+
+
+@pytest.mark.parametrize("n", [2, 3, 6, 7])
+def test_meet_in_the_middle(n):
+    for seed in range(10):
+        g = random_dag(n, 0.3, seed)
+        assert meet_in_the_middle(g) == brute_force(g)
+        assert meet_in_the_middle(Poset.from_graph(g)) == brute_force(g)
+
+
+def test_meet_in_the_middle_keeps_fewer_states():
+    g = create_graph(os.path.join(DATA, "vhod_antichain_20_5.txt"))
+    memo = {}
+    instrumentation = Instrumentation()
+    assert meet_in_the_middle(g, instrumentation.counters) == bitmask_divide_and_conquer(g, memo)
+    # Celotna mreza idealov je v memo, meet_in_the_middle pa hkrati hrani le nekaj nivojev
+    assert instrumentation.counters["peak_memo"] < len(memo)
@@ -0,0 +1,51 @@
+import os
+
+import networkx as nx
+
+from algorithms import bitmask_divide_and_conquer
+from approximate import approximate_count, _comparisons, _estimate
+from data_preparation import create_graph
+from relations import get_closure_bitmasks, get_bitmask_matrix
+
+from conftest import DATA
+
+EPSILON = 0.1
+INSTANCES = [f"vhod_{n}_{k}.txt" for n in (5, 10, 15, 20) for k in range(1, 6)]
+
+
+def test_comparisons_make_a_chain():
+    graph = create_graph(os.path.join(DATA, "vhod_20_1.txt"))
+    _, _, up = get_closure_bitmasks(graph)
+    less = get_bitmask_matrix(up)
+    order = less.sum(axis=0).argsort(kind="stable")
+    position = {x: i for i, x in enumerate(order)}
+    comparisons = _comparisons(order)
+    assert all(position[x] < position[y] for x, y in comparisons)
+    # Primerjave skupaj dolocajo vse pare sosednjih elementov v order
+    assert {(order[i], order[i + 1]) for i in range(len(order) - 1)} <= set(comparisons)
+
+
+def test_chain_is_exact():
+    # Veriga ima eno linearno razsiritev, zato ni nobenega delezu za oceno
+    chain = nx.transitive_closure(nx.path_graph(6, create_using=nx.DiGraph))
+    _, _, up = get_closure_bitmasks(chain)
+    assert _estimate(get_bitmask_matrix(up), 10, 5, 25, 0) == 0.0
+    assert approximate_count(chain, processes=1, seed=0) == (1.0, (1.0, 1.0))
+
+
+def test_single_replicate_is_clamped():
+    graph = create_graph(os.path.join(DATA, "vhod_10_1.txt"))
+    estimate, (lower, upper) = approximate_count(graph, replicates=1, max_replicates=1, processes=1, seed=0)
+    assert lower <= estimate <= upper
+
+
+def test_error_and_coverage():
+    misses = 0
+    for seed, name in enumerate(INSTANCES):
+        graph = create_graph(os.path.join(DATA, name))
+        exact = bitmask_divide_and_conquer(graph)
+        estimate, (lower, upper) = approximate_count(graph, EPSILON, processes=1, seed=seed)
+        assert abs(estimate / exact - 1) < 2 * EPSILON, name
+        misses += not lower <= exact <= upper
+    # Pri 95 % zanesljivosti pricakujemo eno zgresitev; vec kot tri se pri 20 primerih zgodijo v manj kot 2 %
+    assert misses <= 3
@@ -0,0 +1,45 @@
+import os
+from itertools import combinations
+
+import pytest
+
+from algorithms import bitmask_divide_and_conquer
+from chains import chain_count, get_chain_decomposition
+from data_preparation import create_graph, read_poset
+
+from conftest import DATA, random_dag, brute_force
+
+
+def width(down, n):
+    # Najvecja antiveriga, poiskana s pregledom vseh podmnozic
+    for size in range(n, 0, -1):
+        for subset in combinations(range(n), size):
+            if all(not (down[v] >> u) & 1 and not (down[u] >> v) & 1 for u, v in combinations(subset, 2)):
+                return size
+    return 0
+
+
+@pytest.mark.parametrize("p", [0.0, 0.2, 0.5, 1.0])
+def test_decomposition_is_minimal(p):
+    for seed in range(10):
+        g = random_dag(7, p, seed)
+        labels, down, chains = get_chain_decomposition(g)
+        assert sorted(i for chain in chains for i in chain) == list(range(7))
+        for chain in chains:
+            assert all((down[v] >> u) & 1 for u, v in zip(chain, chain[1:]))
+        assert len(chains) == width(down, 7)
+
+
+@pytest.mark.parametrize("p", [0.0, 0.2, 0.5, 1.0])
+def test_random_dags(p):
+    for seed in range(10):
+        g = random_dag(7, p, seed)
+        assert chain_count(g) == brute_force(g)
+
+
+def test_data_files():
+    for name in ["vhod_20_1.txt", "vhod_30_2.txt"]:
+        path = os.path.join(DATA, name)
+        expected = bitmask_divide_and_conquer(create_graph(path))
+        assert chain_count(create_graph(path)) == expected
+        assert chain_count(read_poset(path)) == expected
@@ -0,0 +1,37 @@
+import io
+import os
+
+import pytest
+
+from cli import get_algorithm, serve
+from data_preparation import read_instances, read_edges
+
+from conftest import DATA
+
+
+def _text(*names):
+    return "".join(open(os.path.join(DATA, name)).read() for name in names)
+
+
+def test_read_instances():
+    instances = list(read_instances(io.StringIO(_text("vhod_5_1.txt", "vhod_10_2.txt") + "\nR 3\n0 1 2\n2 0 1\n")))
+    assert [n for n, _ in instances] == [5, 10, 3]
+    assert (instances[1][1] == read_edges(os.path.join(DATA, "vhod_10_2.txt"))[1]).all()
+
+
+def test_truncated_instance():
+    text = _text("vhod_5_1.txt") + "".join(open(os.path.join(DATA, "vhod_5_2.txt")).readlines()[:3])
+    instances = read_instances(io.StringIO(text))
+    next(instances)
+    with pytest.raises(ValueError, match="Primer 2"):
+        next(instances)
+
+
+def test_serve_keeps_going():
+    requests = io.StringIO(f"{os.path.join(DATA, 'vhod_5_1.txt')}\n5 1 1\n3 1 1 2\n")
+    responses = io.StringIO()
+    serve(get_algorithm("bitmask"), requests, responses)
+    lines = responses.getvalue().splitlines()
+    assert lines[0] == "8"
+    assert lines[1].startswith("napaka:")
+    assert lines[2] == "3"
@@ -0,0 +1,74 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from cache import CountCache
+from algorithms import bitmask_divide_and_conquer
+from evaluation import compare_algorithms, read_results, measure_execution, bootstrap_ci, _converged, _collect_times
+
+from conftest import random_dag, brute_force
+
+SIZES = [5, 10]
+
+
+def _sweep(results_path, cache):
+    for name in ["time_comparison.png", "A_size_comparison.png", "large_matching.csv"]:
+        if os.path.exists(f"../results/{name}"):
+            os.remove(f"../results/{name}")
+    compare_algorithms(SIZES, 2, 0, cache=cache, results_path=results_path, repeats=3)
+    return pd.read_csv("../results/large_matching.csv")
+
+
+def test_repeated_sweep_with_cache(workdir):
+    workdir(*[f"vhod_{n}_{k}.txt" for n in SIZES for k in (1, 2)])
+    cache = CountCache("../results/cache.sqlite")
+
+    first = _sweep("../results/first.jsonl", cache)
+    second = _sweep("../results/second.jsonl", cache)
+
+    # Drugi zagon vse case vzame iz predpomnilnika, grafi in .csv pa kljub temu niso prazni
+    records = read_results("../results/second.jsonl")
+    assert records and all(r.get("cached", False) for r in records)
+    assert not second.isna().any().any()
+    pd.testing.assert_frame_equal(first, second)
+    assert os.path.exists("../results/time_comparison.png")
+    assert os.path.exists("../results/A_size_comparison.png")
+
+
+
+def test_bootstrap_ci_coverage():
+    rng = np.random.default_rng(0)
+    covered = 0
+    for _ in range(200):
+        lower, upper = bootstrap_ci(rng.normal(10, 2, size=30), rng=rng)
+        assert lower <= upper
+        covered += lower <= 10 <= upper
+    # Bootstrap percentilni interval pri 30 meritvah nekoliko podcenjuje sirino
+    assert 0.88 <= covered / 200 <= 0.99
+
+
+def test_converged():
+    times = [1.0, 1.01, 0.99, 1.0, 1.02]
+    assert not _converged(times[:4], precision=0.05)
+    assert _converged(times, precision=0.05)
+    assert not _converged(times, precision=1e-4)
+    assert _converged(times, precision=1e-4, max_time=5)
+    assert not _converged(times)
+
+
+def test_adaptive_measurement_stops_early():
+    g = random_dag(6, 0.3, 0)
+    times, result = measure_execution(g, bitmask_divide_and_conquer, repeats=50, precision=10.0)
+    assert len(times) == 5
+    assert result == brute_force(g)
+    times, _ = measure_execution(g, bitmask_divide_and_conquer, repeats=7, precision=0.0)
+    assert len(times) == 7
+
+
+def test_collect_times_averages_each_job():
+    results = [{"n": 5, "algorithm": "a", "times": [1.0, 3.0]},
+               {"n": 5, "algorithm": "a", "times": [4.0]},
+               {"n": 5, "algorithm": "b", "times": [9.0]},
+               {"n": 10, "algorithm": "a", "times": [9.0]}]
+    assert np.array_equal(_collect_times(results, 5, "a"), [2.0, 4.0])
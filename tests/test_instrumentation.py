@@ -0,0 +1,30 @@
+import os
+
+from algorithms import paper_algorithm, divide_and_conquer, bitmask_divide_and_conquer
+from data_preparation import create_graph
+from instrumentation import Instrumentation
+
+from conftest import DATA
+
+
+def test_report_is_returned():
+    graph = create_graph(os.path.join(DATA, "vhod_20_1.txt"))
+    count, large_case, A_size = paper_algorithm(graph)
+    result = paper_algorithm(graph, instrumentation=True)
+    assert result[:3] == (count, large_case, A_size)
+
+    report = result[3]
+    assert {"reduction", "matching", "counting"} <= set(report["timers"])
+    assert report["counters"]["states"] > 0
+    assert report["counters"]["memo_misses"] == report["counters"]["states"]
+
+
+def test_report_of_given_instrumentation():
+    graph = create_graph(os.path.join(DATA, "vhod_antichain_15_2.txt"))
+    instrumentation = Instrumentation(profile_phase="counting")
+    result = paper_algorithm(graph, counter=bitmask_divide_and_conquer, decomposition=True,
+                             instrumentation=instrumentation)
+    assert result[0] == divide_and_conquer(graph)
+    assert result[3] == instrumentation.report()
+    assert "decomposition" in result[3]["timers"]
+    assert "counting" in instrumentation.profiles
@@ -0,0 +1,88 @@
+import os
+
+from algorithms import divide_and_conquer, bitmask_divide_and_conquer
+from data_preparation import create_graph, read_poset
+from memo import MemoStore, with_memo_store
+
+from conftest import DATA
+
+
+class CountingConnection:
+    """
+    Ovoj povezave sqlite, ki steje poizvedbe
+    """
+
+    def __init__(self, connection):
+        self.connection = connection
+        self.queries = 0
+
+    def execute(self, *args):
+        self.queries += 1
+        return self.connection.execute(*args)
+
+    def __getattr__(self, name):
+        return getattr(self.connection, name)
+
+
+def test_stats_under_eviction(tmp_path):
+    with MemoStore(max_entries=2, spill_dir=tmp_path, spill_batch=1) as memo:
+        for key in range(1, 5):
+            memo[key] = 10 * key
+        assert memo.stats() == {"hits": 0, "misses": 0, "evictions": 2, "disk_hits": 0, "entries": 2, "spilled": 2}
+
+        # 1 je na disku, 4 v pomnilniku, 5 ni nikjer
+        assert memo.get(1) == 10
+        assert memo.get(4) == 40
+        assert memo.get(5) is None
+        assert memo.stats() == {"hits": 2, "misses": 1, "evictions": 3, "disk_hits": 1, "entries": 2, "spilled": 3}
+        assert 3 in memo and 5 not in memo
+
+
+def test_misses_do_not_query_disk(tmp_path):
+    with MemoStore(max_entries=1, spill_dir=tmp_path, spill_batch=1) as memo:
+        memo[1] = 1
+        memo[2] = 2
+        memo.connection = CountingConnection(memo.connection)
+        for key in range(3, 100):
+            assert memo.get(key) is None
+        assert memo.connection.queries == 0
+        assert memo.get(1) == 1
+        assert memo.connection.queries == 1
+
+
+def test_stores_do_not_share_files(tmp_path):
+    first = MemoStore(max_entries=1, spill_dir=tmp_path, spill_batch=1)
+    second = MemoStore(max_entries=1, spill_dir=tmp_path, spill_batch=1)
+    for key in range(4):
+        first[key] = key
+        second[key] = 10 + key
+    assert [first[key] for key in range(4)] == list(range(4))
+    assert [second[key] for key in range(4)] == [10 + key for key in range(4)]
+    first.close()
+    second.close()
+    assert os.listdir(tmp_path) == []
+
+
+def test_counts_under_eviction(tmp_path):
+    for name in ["vhod_15_1.txt", "vhod_20_2.txt", "vhod_25_1.txt", "vhod_antichain_15_3.txt"]:
+        path = os.path.join(DATA, name)
+        exact = bitmask_divide_and_conquer(create_graph(path))
+        for partial_order in [create_graph(path), read_poset(path)]:
+            with MemoStore() as memo:
+                divide_and_conquer(partial_order, memo)
+                ideals = memo.stats()["misses"]
+            with MemoStore(max_entries=20, spill_dir=tmp_path, spill_batch=7) as memo:
+                assert divide_and_conquer(partial_order, memo) == exact
+                stats = memo.stats()
+            # Izrinjenih idealov ne racunamo znova
+            assert stats["evictions"] > 0 and stats["disk_hits"] > 0
+            assert stats["misses"] == ideals
+
+
+def test_with_memo_store_spills_by_default():
+    graph = create_graph(os.path.join(DATA, "vhod_20_1.txt"))
+    unbounded = with_memo_store(divide_and_conquer)
+    bounded = with_memo_store(divide_and_conquer, max_entries=50)
+    assert bounded(graph) == unbounded(graph) == bitmask_divide_and_conquer(graph)
+    assert bounded.stats["evictions"] > 0
+    assert bounded.stats["misses"] == unbounded.stats["misses"]
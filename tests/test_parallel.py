@@ -0,0 +1,28 @@
+import os
+
+import pytest
+
+from algorithms import bitmask_divide_and_conquer
+from data_preparation import create_graph, read_poset
+from parallel import parallel_count
+
+from conftest import DATA, random_dag, brute_force
+
+
+@pytest.mark.parametrize("processes", [1, 2, 3])
+def test_random_dags(processes):
+    for seed in range(5):
+        g = random_dag(7, 0.3, seed)
+        assert parallel_count(g, processes) == brute_force(g)
+
+
+@pytest.mark.parametrize("name", ["vhod_20_1.txt", "vhod_antichain_15_3.txt"])
+def test_data_files(name):
+    path = os.path.join(DATA, name)
+    expected = bitmask_divide_and_conquer(create_graph(path))
+    assert parallel_count(create_graph(path), 2) == expected
+    assert parallel_count(read_poset(path), 3) == expected
+
+
+def test_trivial():
+    assert parallel_count(random_dag(1, 0.5, 0), 2) == 1
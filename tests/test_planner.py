@@ -0,0 +1,46 @@
+import os
+
+import pytest
+
+from algorithms import bitmask_divide_and_conquer
+from data_preparation import create_graph, read_poset
+from planner import Planner, STRATEGIES, FEATURES, estimate_ideals
+
+from conftest import ROOT, DATA, random_dag, brute_force
+
+
+def forced(strategy):
+    # Model z eno samo strategijo, ki ji napove konstanten cas
+    return Planner({"features": {strategy: FEATURES[strategy]},
+                    "weights": {strategy: [-10.0] + [0.0] * len(FEATURES[strategy])}, "samples": 64})
+
+
+def test_estimate_ideals():
+    for seed in range(5):
+        g = random_dag(10, 0.2, seed)
+        memo = {}
+        bitmask_divide_and_conquer(g, memo)
+        # V memo so vsi ideali, tudi prazni
+        assert estimate_ideals(g, samples=20000, seed=seed) == pytest.approx(len(memo), rel=0.05)
+
+
+@pytest.mark.parametrize("strategy", sorted(STRATEGIES))
+def test_every_strategy(strategy):
+    planner = forced(strategy)
+    for seed in range(5):
+        g = random_dag(7, 0.3, seed)
+        assert planner.count(g) == brute_force(g)
+    assert planner.records and all(record["strategy"] == strategy for record in planner.records)
+
+
+def test_calibrated_model(tmp_path):
+    planner = Planner.load(os.path.join(ROOT, "results", "cost_model.json"), record_path=tmp_path / "plan.jsonl")
+    for name in ["vhod_20_1.txt", "vhod_antichain_20_5.txt"]:
+        path = os.path.join(DATA, name)
+        assert planner(read_poset(path)) == bitmask_divide_and_conquer(create_graph(path))
+
+    assert all(record["strategy"] in STRATEGIES for record in planner.records)
+    for record in planner.records:
+        assert record["strategy"] == min(record["predicted"], key=record["predicted"].get)
+    with open(tmp_path / "plan.jsonl") as f:
+        assert len(f.readlines()) == len(planner.records)
@@ -0,0 +1,51 @@
+import os
+
+import numpy as np
+
+from algorithms import paper_algorithm, bitmask_divide_and_conquer
+from data_preparation import create_graph, read_poset
+from relations import Poset, ReachabilityIndex, get_closure_bitmasks, get_bitmask_matrix, get_less_matrix
+
+from conftest import DATA
+
+
+def test_less_is_lazy_and_shared():
+    poset = read_poset(os.path.join(DATA, "vhod_20_1.txt"))
+    view = poset.restrict(poset.mask >> 3)
+    assert poset._less[0] is None
+    assert view.less is poset.less
+    assert not poset.less.flags.writeable
+
+
+def test_less_matrix_of_view():
+    graph = create_graph(os.path.join(DATA, "vhod_20_2.txt"))
+    poset = Poset.from_graph(graph)
+    mask = sum(1 << i for i in range(0, 20, 3))
+    view = poset.restrict(mask)
+    _, _, up = get_closure_bitmasks(view.to_graph())
+    assert np.array_equal(get_less_matrix(view), get_bitmask_matrix(up))
+    assert np.array_equal(get_less_matrix(poset), get_less_matrix(graph))
+
+
+def test_reachability_index_uses_poset_matrix():
+    graph = create_graph(os.path.join(DATA, "vhod_15_3.txt"))
+    from_poset = ReachabilityIndex(Poset.from_graph(graph)).comparability_matrix()
+    assert np.array_equal(from_poset, ReachabilityIndex(graph).comparability_matrix())
+
+
+def test_add_chains():
+    poset = Poset.from_edges(4, np.array([[1, 3]]))
+    chained = poset.add_chains([[2, 1], [3, 4]])
+    assert sorted(chained.edges()) == [(1, 3), (1, 4), (2, 1), (2, 3), (2, 4), (3, 4)]
+    assert sorted(poset.edges()) == [(1, 3)]
+
+
+def test_paper_algorithm_on_poset():
+    for n in (5, 10, 15, 20):
+        for k in range(1, 6):
+            path = os.path.join(DATA, f"vhod_{n}_{k}.txt")
+            graph = create_graph(path)
+            for triplets in (True, False):
+                result = paper_algorithm(read_poset(path), triplets, counter=bitmask_divide_and_conquer)
+                assert result == paper_algorithm(graph, triplets, counter=bitmask_divide_and_conquer)
+                assert result[0] == bitmask_divide_and_conquer(graph)
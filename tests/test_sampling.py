@@ -0,0 +1,51 @@
+from collections import Counter
+from itertools import permutations
+from statistics import NormalDist
+
+import pytest
+
+from relations import Poset
+from sampling import LinearExtensionSampler
+
+from conftest import random_dag, brute_force
+
+
+def chi_square_critical(df, alpha):
+    """
+    Kriticna vrednost porazdelitve hi-kvadrat (Wilson-Hilferty priblizek, scipy ni na voljo)
+    """
+    z = NormalDist().inv_cdf(1 - alpha)
+    return df * (1 - 2 / (9 * df) + z * (2 / (9 * df)) ** 0.5) ** 3
+
+
+def extensions(g):
+    edges = list(g.edges())
+    return [order for order in permutations(g.nodes())
+            if all(order.index(u) < order.index(v) for u, v in edges)]
+
+
+@pytest.mark.parametrize("batch", [False, True])
+def test_uniform(batch):
+    g = random_dag(6, 0.3, 1)
+    valid = extensions(g)
+    sampler = LinearExtensionSampler(g, seed=0)
+    assert sampler.count == len(valid) == brute_force(g)
+
+    draws = 200 * len(valid)
+    if batch:
+        samples = [tuple(row) for row in sampler.sample_batch(draws).tolist()]
+    else:
+        samples = [tuple(sampler.sample()) for _ in range(draws)]
+    observed = Counter(samples)
+    assert set(observed) <= set(valid)
+
+    expected = draws / len(valid)
+    statistic = sum((observed[order] - expected) ** 2 / expected for order in valid)
+    assert statistic < chi_square_critical(len(valid) - 1, 0.001)
+
+
+def test_poset_input_and_trivial():
+    g = random_dag(5, 0.4, 2)
+    sampler = LinearExtensionSampler(Poset.from_graph(g), seed=0)
+    assert set(map(tuple, sampler.sample_batch(500).tolist())) == set(extensions(g))
+    assert LinearExtensionSampler(random_dag(1, 0.5, 0)).sample() == [1]
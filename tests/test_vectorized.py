@@ -0,0 +1,46 @@
+import os
+
+import networkx as nx
+import pytest
+
+from algorithms import bitmask_divide_and_conquer
+from data_preparation import create_graph, read_poset
+from vectorized import vectorized_count, get_primes, crt, _is_prime
+
+from conftest import DATA, random_dag, brute_force
+
+
+@pytest.mark.parametrize("p", [0.0, 0.3, 0.7])
+def test_random_dags(p):
+    for seed in range(10):
+        g = random_dag(7, p, seed)
+        assert vectorized_count(g) == brute_force(g)
+
+
+def test_small_primes_need_several_residues():
+    # Antiveriga s 7 elementi ima 5040 linearnih razsiritev, kar presega vsakega od modulov
+    g = random_dag(7, 0.0, 0)
+    assert vectorized_count(g, primes=[101, 103]) == 5040
+
+
+def test_data_files():
+    for name in ["vhod_20_1.txt", "vhod_25_2.txt", "vhod_antichain_15_4.txt"]:
+        path = os.path.join(DATA, name)
+        expected = bitmask_divide_and_conquer(create_graph(path))
+        assert vectorized_count(create_graph(path)) == expected
+        assert vectorized_count(read_poset(path)) == expected
+
+
+def test_more_than_one_word():
+    # Veriga s 70 elementi in en neprimerljiv element: ideali zasedejo dve 64-bitni besedi
+    g = nx.DiGraph()
+    g.add_nodes_from(range(71))
+    nx.add_path(g, range(70))
+    assert vectorized_count(g) == 71
+
+
+def test_primes_and_crt():
+    primes = get_primes(3)
+    assert all(_is_prime(p) and p < 2 ** 55 for p in primes)
+    x = 2 ** 150 + 12345
+    assert crt([x % p for p in primes], primes) == x